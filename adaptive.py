@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+# Algoritmos adaptativos para acotar el rango de una funci\'on: en lugar de
+# subdividir uniformemente el intervalo (como `split_interval` +
+# `range_interval_f`), s\'olo se bisectan las cajas que a\'un pueden mejorar
+# la cota. `evaluate_adaptive` hace lo mismo con la precisi\'on: s\'olo se
+# sube donde el redondeo es lo que hace anchas las cotas.
+
+import heapq
+import itertools
+from collections import deque
+
+from intervalo import Intervalo, iter_split_interval, mp, mpf
+from float_interval import FloatInterval
+
+
+def _bisect(x):
+    """Divide el intervalo x en dos mitades"""
+    m = x.mid()
+    return x.__class__(x.lo, m), x.__class__(m, x.hi)
+
+
+def global_minimize( fun, x, tol=1e-3, max_evaluations=100000 ):
+    """
+    Minimizaci\'on global por ramificaci\'on y acotamiento (Moore-Skelboe).
+
+    Las cajas se guardan en una cola de prioridad ordenada por la cota inferior
+    de `fun` sobre la caja. Se bisecta siempre la caja con menor cota inferior;
+    la evaluaci\'on de `fun` en el punto medio de cada caja da una cota superior
+    del m\'inimo, y se descartan las cajas cuya cota inferior ya no puede
+    mejorarla. Se termina cuando la cota inferior y la superior difieren en
+    menos de `tol` (o se llega a `max_evaluations` evaluaciones de `fun`).
+
+    Regresa un intervalo (de la clase de x) que contiene el m\'inimo global de
+    `fun` sobre x, y la lista de cajas que pueden contener a los
+    minimizadores. Si fun es vac\'ia en todas las cajas, regresa el intervalo
+    vac\'io y [].
+    """
+    counter = itertools.count()
+    upper = fun( x.__class__(x.mid()) ).hi
+    heap = [ (fun(x).lo, next(counter), x) ]
+    num_evaluations = 2
+
+    while heap and num_evaluations < max_evaluations:
+        lower, _, box = heap[0]
+        if upper - lower <= tol:
+            break
+
+        heapq.heappop(heap)
+        for half in _bisect(box):
+            upper = min( upper, fun( x.__class__(half.mid()) ).hi )
+            range_half = fun(half)
+            num_evaluations += 2
+
+            if range_half.lo <= upper:
+                heapq.heappush( heap, (range_half.lo, next(counter), half) )
+
+    candidates = [ (lo, box) for (lo, _, box) in sorted(heap) if lo <= upper ]
+    if not candidates:
+        return x.empty(), []
+
+    minimum = x._from_bounds( candidates[0][0], upper )
+    return minimum, [ box for (lo, box) in candidates ]
+
+def range_enclose( fun, x, tol=1e-3, max_evaluations=100000 ):
+    """
+    Cota del rango de `fun` sobre x, con una sobreestimaci\'on de a lo m\'as
+    `tol` en cada extremo, usando `global_minimize` para el m\'inimo de fun y
+    para el m\'aximo (m\'inimo de -fun). Es vac\'ia si fun lo es.
+    """
+    minimum, _ = global_minimize( fun, x, tol, max_evaluations )
+    minus_maximum, _ = global_minimize( lambda y: -fun(y), x, tol, max_evaluations )
+    if minimum.is_empty() or minus_maximum.is_empty():
+        return x.empty()
+
+    return x._from_bounds( minimum.lo, -minus_maximum.lo )
+
+
+class RangeRefinement(object):
+    """
+    Refinamiento incremental del rango de `fun` sobre x. Guarda la lista de
+    cajas con sus cotas `fun(caja)`, y en cada `refine()` bisecta s\'olo las
+    cajas que pueden definir la frontera del hull: aquellas cuya cota llega
+    por debajo del menor valor conocido de fun (la evaluaci\'on en el punto
+    medio de alguna caja), o por encima del mayor. Las dem\'as no pueden
+    cambiar el hull, y sus evaluaciones se reutilizan en el siguiente nivel.
+
+        refinement = RangeRefinement(f, x)
+        for level in range(10):
+            refinement.refine()
+        refinement.range()
+    """
+
+    def __init__(self, fun, x, num_divisions=1):
+        self.fun = fun
+        self.num_evaluations = 0
+        self.level = 0
+        self.boxes = [ self._evaluate(box) for box in iter_split_interval(x, num_divisions) ]
+
+    def _evaluate(self, box):
+        """(caja, fun(caja), fun(punto medio))"""
+        self.num_evaluations += 2
+        return ( box, self.fun(box), self.fun(box.__class__(box.mid())) )
+
+    def enclosures(self):
+        """Lista de pares (caja, fun(caja)) del nivel actual"""
+        return [ (box, value) for (box, value, point) in self.boxes ]
+
+    def range(self):
+        """Hull de las cotas de todas las cajas: una cota del rango de fun"""
+        hull = self.boxes[0][1]
+        for (box, value, point) in self.boxes[1:]:
+            hull = hull.hull(value)
+        return hull
+
+    def refine(self, levels=1):
+        """
+        Bisecta las cajas de la frontera (`levels` veces); regresa el nuevo
+        `range()`
+        """
+        for level in range(levels):
+            # fun toma valores <= lower_mark y >= upper_mark
+            lower_mark = min( point.hi for (box, value, point) in self.boxes )
+            upper_mark = max( point.lo for (box, value, point) in self.boxes )
+
+            boxes = []
+            for entry in self.boxes:
+                box, value, point = entry
+                if value.lo <= lower_mark or value.hi >= upper_mark:
+                    boxes.extend( self._evaluate(half) for half in _bisect(box) )
+                else:
+                    boxes.append(entry)
+
+            self.boxes = boxes
+            self.level += 1
+
+        return self.range()
+
+
+def _evaluate_at_prec( fun, box, prec ):
+    """fun(box) con `FloatInterval` si prec <= 53, o con `Intervalo` a prec bits"""
+    if prec <= 53:
+        return fun( FloatInterval(box.lo, box.hi) )
+
+    with mp.workprec(prec):
+        return fun( Intervalo(box.lo, box.hi) )
+
+def evaluate_adaptive( fun, x, target_width, max_prec=2048, max_evaluations=10000 ):
+    """
+    Cota del rango de `fun` sobre x, formada por cajas cuyas cotas tienen
+    ancho a lo m\'as `target_width` (as\'i que cada extremo se sobreestima a
+    lo m\'as en target_width), pagando la precisi\'on alta s\'olo donde
+    hace falta.
+
+    Se eval\'ua primero con `FloatInterval` (doble precisi\'on). Cada caja cuya
+    cota es m\'as ancha que target_width se vuelve a evaluar con el doble de
+    bits (dentro de `mp.workprec`, sin cambiar la precisi\'on global); si eso
+    no reduce el ancho al menos a la mitad, lo que domina es la dependencia y
+    no el redondeo, as\'i que la caja se bisecta (y sus mitades se eval\'uan
+    con la precisi\'on anterior, que bastaba). Las mitades se siguen
+    bisectando mientras eso reduzca su ancho; cuando deja de hacerlo (se
+    lleg\'o al error de redondeo) se vuelve a subir la precisi\'on. Las cajas
+    se refinan por niveles, de las m\'as grandes a las m\'as chicas.
+
+    Se deja de refinar al llegar a `max_evaluations` evaluaciones (o a cajas
+    que ya no se pueden bisectar): las cajas pendientes se eval\'uan una vez
+    m\'as y la cota puede ser m\'as ancha que target_width. Regresa un
+    `Intervalo`.
+    """
+    # (caja, bits, ancho anterior, si el ancho anterior es de la misma caja con
+    # la mitad de bits o de la caja madre con los mismos bits)
+    boxes = deque([ (x, 53, None, False) ])
+    lower, upper = [], []
+    num_evaluations = 0
+
+    while boxes:
+        box, prec, previous_width, raised = boxes.popleft()
+        value = _evaluate_at_prec( fun, box, prec )
+        num_evaluations += 1
+        width = value.hi - value.lo
+
+        if width > target_width and num_evaluations < max_evaluations:
+            if raised:
+                # el doble de bits redujo el ancho?
+                raise_prec = width <= previous_width / 2
+                if not raise_prec:
+                    prec //= 2
+            else:
+                # bisectar ya no reduce el ancho? (la caja inicial no tiene madre)
+                raise_prec = previous_width is None or width > 0.75 * previous_width
+
+            if raise_prec and prec < max_prec:
+                boxes.append( (box, 2*prec, width, True) )
+                continue
+
+            m = box.mid()
+            if box.lo < m < box.hi:
+                parent_width = previous_width if raised and not raise_prec else width
+                boxes.extend( (half, prec, parent_width, False) for half in _bisect(box) )
+                continue
+
+        # las cotas de precisi\'on distinta se juntan redondeando hacia afuera
+        lower.append( mpf(value.lo, rounding='f') )
+        upper.append( mpf(value.hi, rounding='c') )
+
+    return Intervalo._from_bounds( min(lower), max(upper) )
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+
+# Diferenciaci\'on autom\'atica (modo hacia adelante) con intervalos: un
+# "n\'umero dual" cuyo valor y derivada son intervalos. Evaluando una funci\'on
+# sobre `DualInterval.variable(x)` se obtienen en una sola pasada la extensi\'on
+# natural f(x) y una cota de f'(x) sobre todo el intervalo x.
+
+from intervalo import Intervalo, exp, log, sin, cos, tan, sincos
+
+
+class DualInterval(object):
+    """
+    N\'umero dual (val, der), con `val` y `der` de tipo `Intervalo` (o una
+    subclase, como `FloatInterval`). Las operaciones siguen las reglas de
+    derivaci\'on, de modo que si f se eval\'ua en (x, 1) el resultado es
+    (f(x), f'(x)) extendidas sobre intervalos.
+    """
+
+    __slots__ = ('val', 'der')
+
+    def __init__(self, val, der=None):
+        if not isinstance(val, Intervalo):
+            val = Intervalo(val)
+
+        if der is None:   # constant
+            der = val.__class__(0)
+
+        self.val, self.der = val, val.make_interval(der)
+
+    @classmethod
+    def variable(cls, x):
+        """La variable independiente sobre el intervalo x: (x, 1)"""
+        if not isinstance(x, Intervalo):
+            x = Intervalo(x)
+        return cls(x, x.__class__(1))
+
+
+    def __repr__(self):
+        return "DualInterval({}, {})".format(repr(self.val), repr(self.der))
+
+    def __str__(self):
+        return "({}, {})".format(self.val, self.der)
+
+
+    def __add__(self, otro):
+        otro = self.make_dual(otro)
+        return DualInterval(self.val + otro.val, self.der + otro.der)
+
+    def __radd__(self, otro):
+        return self + otro
+
+    def __sub__(self, otro):
+        otro = self.make_dual(otro)
+        return DualInterval(self.val - otro.val, self.der - otro.der)
+
+    def __rsub__(self, otro):
+        return -(self - otro)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return DualInterval(-self.val, -self.der)
+
+    def __mul__(self, otro):
+        otro = self.make_dual(otro)
+        return DualInterval(self.val * otro.val,
+                            self.der * otro.val + self.val * otro.der)
+
+    def __rmul__(self, otro):
+        return self * otro
+
+    def __div__(self, otro):
+        otro = self.make_dual(otro)
+        quotient = self.val / otro.val
+        return DualInterval(quotient, (self.der - quotient * otro.der) / otro.val)
+
+    __truediv__ = __div__
+
+    def __rdiv__(self, otro):
+        return self.make_dual(otro) / self
+
+    __rtruediv__ = __rdiv__
+
+    def __pow__(self, exponent):
+        """
+        Potencia: si el exponente es un n\'umero, (u**n, n u**(n-1) u');
+        si es un intervalo o un dual, se usa exp(exponent*log(u))
+        """
+        if isinstance(exponent, (DualInterval, Intervalo)):
+            return ( self.make_dual(exponent) * self.log() ).exp()
+
+        if exponent == 0:
+            return DualInterval(self.val**0)
+
+        return DualInterval(self.val**exponent,
+                            exponent * self.val**(exponent - 1) * self.der)
+
+    def __rpow__(self, base):
+        return self.make_dual(base)**self
+
+
+    def exp(self):
+        val = exp(self.val)
+        return DualInterval(val, val * self.der)
+
+    def log(self):
+        return DualInterval(log(self.val), self.der / self.val)
+
+    def sin(self):
+        return DualInterval(sin(self.val), cos(self.val) * self.der)
+
+    def cos(self):
+        return DualInterval(cos(self.val), -sin(self.val) * self.der)
+
+    def tan(self):
+        val = tan(self.val)
+        return DualInterval(val, (1 + val**2) * self.der)
+
+
+    def make_dual(self, a):
+        """Convierte un n\'umero o intervalo en un dual constante"""
+        if isinstance(a, DualInterval):
+            return a
+
+        return DualInterval(self.val.make_interval(a))
+
+
+def derivative_enclosure( fun, x ):
+    """
+    Regresa (f(x), f'(x)): la extensi\'on natural de `fun` sobre el intervalo
+    x y una cota de su derivada sobre x, en una sola evaluaci\'on
+    """
+    result = fun( DualInterval.variable(x) )
+    if not isinstance(result, DualInterval):   # fun is constant
+        result = DualInterval(result)
+
+    return result.val, result.der
+
+def derivative( fun ):
+    """
+    Regresa la funci\'on x -> f'(x) (extendida sobre intervalos), por ejemplo
+    para usarla en `newton.interval_newton(f, derivative(f), x)`
+    """
+    return lambda x: derivative_enclosure(fun, x)[1]
+
+
+class TaylorInterval(object):
+    """
+    Serie de Taylor truncada con coeficientes intervalo: `coeffs[k]` es una
+    cota de f^(k)/k!. Evaluando f sobre `TaylorInterval.variable(x, order)`
+    se obtienen cotas de todas las derivadas de f (hasta `order`) sobre x.
+    Los coeficientes se calculan con las recurrencias usuales (producto de
+    Cauchy, divisi\'on, exp, log, sin/cos).
+    """
+
+    __slots__ = ('coeffs',)
+
+    def __init__(self, coeffs):
+        self.coeffs = coeffs
+
+    @classmethod
+    def variable(cls, x, order=2):
+        """La variable independiente sobre el intervalo x: x + t"""
+        if not isinstance(x, Intervalo):
+            x = Intervalo(x)
+        zero = x.__class__(0)
+        return cls( [x, x.__class__(1)] + [zero]*(order - 1) )
+
+    @property
+    def order(self):
+        return len(self.coeffs) - 1
+
+    def __repr__(self):
+        return "TaylorInterval({})".format(repr(self.coeffs))
+
+
+    def __add__(self, otro):
+        otro = self.make_taylor(otro)
+        return TaylorInterval([ a + b for (a, b) in zip(self.coeffs, otro.coeffs) ])
+
+    def __radd__(self, otro):
+        return self + otro
+
+    def __sub__(self, otro):
+        otro = self.make_taylor(otro)
+        return TaylorInterval([ a - b for (a, b) in zip(self.coeffs, otro.coeffs) ])
+
+    def __rsub__(self, otro):
+        return -(self - otro)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return TaylorInterval([ -a for a in self.coeffs ])
+
+    def __mul__(self, otro):
+        otro = self.make_taylor(otro)
+        a, b = self.coeffs, otro.coeffs
+        if otro is self:    # x*x: the central terms are squares
+            product = lambda j, k: a[j]**2 if 2*j == k else a[j]*a[k-j]
+        else:
+            product = lambda j, k: a[j]*b[k-j]
+
+        return TaylorInterval([ _sum( product(j, k) for j in range(k+1) )
+                                for k in range(len(a)) ])
+
+    def __rmul__(self, otro):
+        return self * otro
+
+    def __div__(self, otro):
+        otro = self.make_taylor(otro)
+        a, b = self.coeffs, otro.coeffs
+        q = [ a[0] / b[0] ]
+        for k in range(1, len(a)):
+            q.append( (a[k] - _sum( b[j]*q[k-j] for j in range(1, k+1) )) / b[0] )
+        return TaylorInterval(q)
+
+    __truediv__ = __div__
+
+    def __rdiv__(self, otro):
+        return self.make_taylor(otro) / self
+
+    __rtruediv__ = __rdiv__
+
+    def __pow__(self, exponent):
+        """
+        Potencia: para exponentes enteros se usa multiplicaci\'on repetida
+        (v\'alida aunque x contenga al 0); en otro caso, la recurrencia de
+        p = a**n,  a p' = n a' p
+        """
+        if isinstance(exponent, (TaylorInterval, Intervalo)):
+            return ( self.make_taylor(exponent) * self.log() ).exp()
+
+        if exponent == int(exponent):
+            exponent = int(exponent)
+            if exponent < 0:
+                return 1 / self**(-exponent)
+
+            result, base, n = self.make_taylor(1), self, exponent
+            while n:     # binary powering
+                if n % 2:
+                    result = result * base
+                base = base * base
+                n //= 2
+
+            # the value itself is tighter with the interval power
+            result.coeffs[0] = self.coeffs[0]**exponent
+            return result
+
+        a = self.coeffs
+        p = [ a[0]**exponent ]
+        for k in range(1, len(a)):
+            p.append( _sum( (exponent*j - (k - j)) * a[j]*p[k-j] for j in range(1, k+1) )
+                      / (k * a[0]) )
+        return TaylorInterval(p)
+
+    def __rpow__(self, base):
+        return self.make_taylor(base)**self
+
+
+    def exp(self):
+        a = self.coeffs
+        e = [ exp(a[0]) ]
+        for k in range(1, len(a)):
+            e.append( _sum( j * a[j]*e[k-j] for j in range(1, k+1) ) / k )
+        return TaylorInterval(e)
+
+    def log(self):
+        a = self.coeffs
+        l = [ log(a[0]) ]
+        for k in range(1, len(a)):
+            l.append( (a[k] - _sum( (j * l[j]*a[k-j] for j in range(1, k)),
+                                    a[0].__class__(0) ) / k) / a[0] )
+        return TaylorInterval(l)
+
+    def _sincos(self):
+        a = self.coeffs
+        s, c = [ [value] for value in sincos(a[0]) ]
+        for k in range(1, len(a)):
+            s.append( _sum( j * a[j]*c[k-j] for j in range(1, k+1) ) / k )
+            c.append( -_sum( j * a[j]*s[k-j] for j in range(1, k+1) ) / k )
+        return TaylorInterval(s), TaylorInterval(c)
+
+    def sin(self):
+        return self._sincos()[0]
+
+    def cos(self):
+        return self._sincos()[1]
+
+    def tan(self):
+        s, c = self._sincos()
+        return s / c
+
+
+    def make_taylor(self, a):
+        """Convierte un n\'umero o intervalo en una serie constante"""
+        if isinstance(a, TaylorInterval):
+            return a
+
+        a = self.coeffs[0].make_interval(a)
+        return TaylorInterval( [a] + [a.__class__(0)]*self.order )
+
+
+def _sum(terms, start=None):
+    """Suma de una sucesi\'on de intervalos (no vac\'ia si no se da `start`)"""
+    terms = iter(terms)
+    total = next(terms) if start is None else start
+    for term in terms:
+        total = total + term
+    return total
+
+
+# Formas centradas: alternativas a la extensi\'on natural que sobreestiman
+# menos el rango (la sobreestimaci\'on decrece cuadr\'aticamente con el ancho
+# del intervalo), de modo que con `range_interval_f` se necesitan muchos
+# menos subintervalos, p.ej.
+#     range_interval_f( lambda y: taylor_form(f, y), split_interval(x, 10) )
+
+def mean_value_form( fun, x ):
+    """
+    Forma del valor medio: f(c) + f'(x) (x - c), con c el punto medio de x,
+    intersectada con la extensi\'on natural f(x)
+    """
+    c = x.__class__( x.mid() )
+    fx, dfx = derivative_enclosure( fun, x )
+    return (fun(c) + dfx * (x - c)).intersection(fx)
+
+def taylor_form( fun, x, order=2 ):
+    """
+    Forma de Taylor centrada de orden `order` (2 por omisi\'on):
+    sum_{k<order} f^(k)(c)/k! (x - c)**k  +  f^(order)(x)/order! (x - c)**order,
+    con c el punto medio de x, intersectada con la extensi\'on natural f(x)
+    """
+    c = x.__class__( x.mid() )
+    at_c = fun( TaylorInterval.variable(c, order) ).coeffs
+    at_x = fun( TaylorInterval.variable(x, order) ).coeffs
+
+    h = x - c
+    result = at_c[0]
+    for k in range(1, order):
+        result = result + at_c[k] * h**k
+    result = result + at_x[order] * h**order
+
+    return result.intersection(at_x[0])
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+
+# Benchmarks de la aritm\'etica de intervalos: operaciones escalares, variantes
+# de __pow__, funciones trigonom\'etricas y el c\'alculo de rangos con
+# split_interval + range_interval_f, para varias precisiones (mp.dps).
+#
+# Uso:
+#   python benchmarks.py                          # corre todo y muestra tiempos
+#   python benchmarks.py --quick                  # s\'olo N <= 1000 y dps=15
+#   python benchmarks.py --filter pow             # s\'olo los que contienen "pow"
+#   python benchmarks.py --save base.json         # guarda una referencia
+#   python benchmarks.py --compare base.json      # compara contra la referencia
+#
+# Con --compare el programa termina con c\'odigo 1 si alg\'un benchmark es m\'as
+# lento que la referencia por m\'as de --threshold (10% por omisi\'on), o si
+# un benchmark de la referencia falla o ya no existe, de modo que se puede
+# correr antes y despu\'es de actualizar sympy/mpmath o NumPy.
+#
+# Los tiempos dependen de la m\'aquina, as\'i que no hay una referencia en el
+# repositorio: en CI se genera con el commit base y se compara en la misma
+# m\'aquina, p.ej.
+#   git checkout <base> && python benchmarks.py --quick --save base.json
+#   git checkout <rama> && python benchmarks.py --quick --compare base.json
+
+import os
+import sys
+import json
+import timeit
+import platform
+import argparse
+import subprocess
+from functools import partial
+
+import numpy as np
+
+from intervalo import *
+from interval_array import IntervalArray, split_interval_array, range_interval_array
+
+
+DPS_VALUES = [15, 30, 100]
+RANGE_SIZES = [10, 100, 1000, 10000, 100000]
+
+BENCHMARKS = []
+
+
+def benchmark( name, per_dps=True ):
+    """
+    Registra un benchmark: la funci\'on decorada prepara los datos (dentro de
+    la precisi\'on mp.dps ya fijada) y regresa la funci\'on sin argumentos cuyo
+    tiempo se mide. Con per_dps=False no depende de la precisi\'on y se corre
+    una sola vez (con la primera de `dps_values`)
+    """
+    def register( setup ):
+        BENCHMARKS.append( (name, setup, per_dps) )
+        return setup
+    return register
+
+
+# Operaciones escalares
+def _operands():
+    return Intervalo(1.25, 2.5), Intervalo(-0.75, 3.5)
+
+@benchmark("construct")
+def bench_construct():
+    return lambda: Intervalo(1.25, 2.5)
+
+@benchmark("construct_mpf")
+def bench_construct_mpf():
+    a, b = mpf(1.25), mpf(2.5)
+    return lambda: Intervalo(a, b)
+
+@benchmark("from_bounds")
+def bench_from_bounds():
+    a, b = mpf(1.25), mpf(2.5)
+    return lambda: Intervalo._from_bounds(a, b)
+
+@benchmark("make_mpf_float")
+def bench_make_mpf_float():
+    return lambda: make_mpf(0.1)
+
+@benchmark("make_mpf_str")
+def bench_make_mpf_str():
+    return lambda: make_mpf("0.1")
+
+@benchmark("add")
+def bench_add():
+    x, y = _operands()
+    return lambda: x + y
+
+@benchmark("sub")
+def bench_sub():
+    x, y = _operands()
+    return lambda: x - y
+
+@benchmark("neg")
+def bench_neg():
+    x, y = _operands()
+    return lambda: -x
+
+@benchmark("mult1")
+def bench_mult1():
+    x, y = _operands()
+    return lambda: x.mult1(y)
+
+@benchmark("mult2")
+def bench_mult2():
+    x, y = _operands()
+    return lambda: x.mult2(y)
+
+@benchmark("div")
+def bench_div():
+    x, y = _operands()
+    return lambda: y / x
+
+@benchmark("hull")
+def bench_hull():
+    x, y = _operands()
+    return lambda: x.hull(y)
+
+@benchmark("intersection")
+def bench_intersection():
+    x, y = _operands()
+    return lambda: x.intersection(y)
+
+
+# Variantes de __pow__
+@benchmark("pow_even")
+def bench_pow_even():
+    x, y = _operands()
+    return lambda: y**2
+
+@benchmark("pow_odd")
+def bench_pow_odd():
+    x, y = _operands()
+    return lambda: y**3
+
+@benchmark("pow_negative")
+def bench_pow_negative():
+    x, y = _operands()
+    return lambda: x**-2
+
+@benchmark("pow_fractional")
+def bench_pow_fractional():
+    x, y = _operands()
+    return lambda: x**0.5
+
+@benchmark("pow_interval")
+def bench_pow_interval():
+    x, y = _operands()
+    return lambda: x**x
+
+@benchmark("rpow")
+def bench_rpow():
+    x, y = _operands()
+    return lambda: 2**x
+
+
+# Funciones elementales; "wide" recorre varios cuadrantes
+@benchmark("exp")
+def bench_exp():
+    x, y = _operands()
+    return lambda: exp(y)
+
+@benchmark("log")
+def bench_log():
+    x, y = _operands()
+    return lambda: log(x)
+
+@benchmark("sin_narrow")
+def bench_sin_narrow():
+    x = Intervalo(1, 1.125)
+    return lambda: sin(x)
+
+@benchmark("sin_wide")
+def bench_sin_wide():
+    x = Intervalo(-2.5, 5)
+    return lambda: sin(x)
+
+@benchmark("cos_narrow")
+def bench_cos_narrow():
+    x = Intervalo(1, 1.125)
+    return lambda: cos(x)
+
+@benchmark("cos_wide")
+def bench_cos_wide():
+    x = Intervalo(-2.5, 5)
+    return lambda: cos(x)
+
+@benchmark("tan")
+def bench_tan():
+    x = Intervalo(0.25, 0.5)
+    return lambda: tan(x)
+
+
+# Importaci\'on de intervalo en un int\'erprete nuevo (incluye su arranque):
+# los procesos de corta duraci\'on pagan este tiempo en cada ejecuci\'on
+@benchmark("import_intervalo", per_dps=False)
+def bench_import_intervalo():
+    command = [ sys.executable, "-c", "import intervalo" ]
+    directory = os.path.dirname(os.path.abspath(__file__))
+    return lambda: subprocess.check_call( command, cwd=directory )
+
+
+# Rango de una funci\'on sobre N subintervalos
+def _f(x):
+    return x**2 - 2*x + sin(x)
+
+def _range_benchmark( N ):
+    x = Intervalo(-3, 3)
+    return lambda: range_interval_f( _f, split_interval(x, N) )
+
+def _range_array_benchmark( N ):
+    x = Intervalo(-3, 3)
+    f = lambda y: y**2 - 2*y + y.sin()
+    return lambda: range_interval_array( f, split_interval_array(x, N) )
+
+for _N in RANGE_SIZES:
+    benchmark("range_N={}".format(_N))( partial(_range_benchmark, _N) )
+    benchmark("range_array_N={}".format(_N))( partial(_range_array_benchmark, _N) )
+
+
+def time_function( stmt, min_time=0.2, repeat=3 ):
+    """
+    Tiempo por llamada de stmt (en segundos): se repite el n\'umero de
+    llamadas hasta que una medici\'on dura al menos min_time, y se toma la
+    m\'inima de `repeat` mediciones
+    """
+    timer = timeit.Timer(stmt)
+    number = 1
+    while True:
+        total = timer.timeit(number)
+        if total >= min_time or number >= 10**6:
+            break
+        number *= 10
+
+    if total >= 5*min_time:      # slow benchmark: one measurement is enough
+        return total / number
+
+    return min( [total] + timer.repeat(repeat - 1, number) ) / number
+
+
+def run_benchmarks( dps_values=DPS_VALUES, pattern=None, max_size=None,
+                    min_time=0.2, out=sys.stdout ):
+    """
+    Corre los benchmarks registrados para cada precisi\'on en `dps_values`.
+    Regresa un diccionario {"nombre[dps=...]": segundos por llamada} (s\'olo
+    "nombre" para los que no dependen de la precisi\'on); si un benchmark
+    falla, su valor es None.
+    """
+    results = {}
+    for dps in dps_values:
+        for (name, setup, per_dps) in BENCHMARKS:
+            if not per_dps and dps != dps_values[0]:
+                continue
+            if pattern is not None and pattern not in name:
+                continue
+            if max_size is not None and "_N=" in name and int(name.split("=")[1]) > max_size:
+                continue
+
+            key = "{}[dps={}]".format(name, dps) if per_dps else name
+            try:
+                with mp.workdps(dps):
+                    seconds = time_function( setup(), min_time )
+            except Exception as error:
+                seconds = None
+                out.write("{:32} error: {!r}\n".format(key, error))
+            else:
+                out.write("{:32} {}\n".format(key, _format_time(seconds)))
+
+            results[key] = seconds
+
+    return results
+
+
+def compare_results( old, new, threshold=0.1 ):
+    """
+    Compara dos corridas. Regresa una lista de (nombre, anterior, nuevo,
+    cociente, estado), con estado "slower", "faster", "same", "new",
+    "missing" o "error"
+    """
+    report = []
+    for key in sorted( set(old) | set(new) ):
+        before, after = old.get(key), new.get(key)
+        if key not in old:
+            report.append( (key, None, after, None, "new") )
+        elif key not in new:
+            report.append( (key, before, None, None, "missing") )
+        elif before is None or after is None:
+            report.append( (key, before, after, None, "error") )
+        else:
+            ratio = after / before
+            if ratio > 1 + threshold:
+                status = "slower"
+            elif ratio < 1 / (1 + threshold):
+                status = "faster"
+            else:
+                status = "same"
+            report.append( (key, before, after, ratio, status) )
+
+    return report
+
+
+def _format_time( seconds ):
+    if seconds is None:
+        return "-"
+    for (unit, scale) in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return "{:8.3f} {}".format(seconds / scale, unit)
+    return "{:8.3f} ns".format(seconds / 1e-9)
+
+def _environment():
+    import importlib
+    backend = importlib.import_module( mp.__module__.rsplit(".", 2)[0] )
+    return { "python": platform.python_version(),
+             "numpy": np.__version__,
+             backend.__name__: backend.__version__ }
+
+
+def main( argv=None ):
+    parser = argparse.ArgumentParser( description="Benchmarks de intervalo.py" )
+    parser.add_argument( "--save", metavar="FILE", help="guarda los resultados en FILE (JSON)" )
+    parser.add_argument( "--compare", metavar="FILE", help="compara contra los resultados en FILE" )
+    parser.add_argument( "--threshold", type=float, default=0.1,
+                         help="diferencia relativa considerada regresi\'on (0.1 = 10%%)" )
+    parser.add_argument( "--filter", metavar="TEXT", help="s\'olo benchmarks cuyo nombre contenga TEXT" )
+    parser.add_argument( "--dps", type=int, nargs="+", default=DPS_VALUES, help="valores de mp.dps" )
+    parser.add_argument( "--quick", action="store_true", help="s\'olo N <= 1000 y dps=15" )
+    parser.add_argument( "--min-time", type=float, default=0.2,
+                         help="duraci\'on m\'inima de cada medici\'on, en segundos" )
+    args = parser.parse_args(argv)
+
+    dps_values, max_size = args.dps, None
+    if args.quick:
+        dps_values, max_size = [15], 1000
+
+    results = run_benchmarks( dps_values, args.filter, max_size, args.min_time )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump( {"environment": _environment(), "results": results},
+                       f, indent=1, sort_keys=True )
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        print("\nComparaci\'on con {} ({})".format(args.compare,
+              ", ".join( "{} {}".format(k, v) for (k, v) in sorted(baseline["environment"].items()) )))
+
+        old = baseline["results"]
+        if args.filter or args.quick:      # only what was run this time
+            old = dict( (k, v) for (k, v) in old.items() if k in results )
+
+        report = compare_results( old, results, args.threshold )
+        for (key, before, after, ratio, status) in report:
+            ratio = "" if ratio is None else "{:6.2f}x".format(ratio)
+            print("{:32} {:>11} {:>11} {:>8}  {}".format(key, _format_time(before),
+                                                       _format_time(after), ratio, status))
+
+        # un benchmark que deja de funcionar (o desaparece) tambi\'en es una regresi\'on
+        if any( row[-1] in ("slower", "error", "missing") for row in report ):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit( main() )
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+
+# Compilaci\'on de funciones para evaluarlas sobre intervalos: la funci\'on se
+# eval\'ua una sola vez sobre variables simb\'olicas (`Expression`), lo que
+# produce un grafo (DAG) de la expresi\'on. Las subexpresiones repetidas se
+# comparten (eliminaci\'on de subexpresiones comunes), y con el grafo se genera
+# el c\'odigo de una funci\'on "plana" de Python, una l\'inea por operaci\'on.
+#
+# El evaluador generado acepta `Intervalo`, `FloatInterval` o `IntervalArray`;
+# con `IntervalArray` cada operaci\'on se hace una sola vez para todas las
+# cajas, sin crear objetos por caja ni por subexpresi\'on repetida.
+
+import inspect
+
+from intervalo import Intervalo
+from autodiff import DualInterval
+
+
+# Formato de cada operaci\'on en el c\'odigo generado
+_TEMPLATES = {
+    'add': '{0} + {1}',
+    'sub': '{0} - {1}',
+    'mul': '{0} * {1}',
+    'div': '{0} / {1}',
+    'pow': '{0} ** {1}',
+    'neg': '-{0}',
+    'exp': '{0}.exp()',
+    'log': '{0}.log()',
+    'sin': '{0}.sin()',
+    'cos': '{0}.cos()',
+    'tan': '{0}.tan()',
+}
+
+_COMMUTATIVE = ('add', 'mul')
+
+
+class Expression(object):
+    """
+    Nodo del grafo de una expresi\'on: una operaci\'on `op` aplicada a los
+    nodos `args`, o una variable ('var') o constante ('const'), cuyo valor
+    est\'a en `value`. Las operaciones sobre nodos crean nuevos nodos del
+    mismo `_Tracer`, que reutiliza los que ya existen.
+    """
+
+    __slots__ = ('tracer', 'index', 'op', 'args', 'value')
+
+    def __init__(self, tracer, index, op, args=(), value=None):
+        self.tracer = tracer
+        self.index = index
+        self.op = op
+        self.args = args
+        self.value = value
+
+    def __repr__(self):
+        return "Expression({})".format(self)
+
+    def __str__(self):
+        if self.op == 'var':
+            return 'x{}'.format(self.value)
+        if self.op == 'const':
+            return repr(self.value)
+        return '(' + _TEMPLATES[self.op].format(*self.args) + ')'
+
+
+    def __add__(self, otro):
+        return self.tracer.operation('add', self, otro)
+
+    def __radd__(self, otro):
+        return self.tracer.operation('add', otro, self)
+
+    def __sub__(self, otro):
+        return self.tracer.operation('sub', self, otro)
+
+    def __rsub__(self, otro):
+        return self.tracer.operation('sub', otro, self)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return self.tracer.operation('neg', self)
+
+    def __mul__(self, otro):
+        return self.tracer.operation('mul', self, otro)
+
+    def __rmul__(self, otro):
+        return self.tracer.operation('mul', otro, self)
+
+    def __div__(self, otro):
+        return self.tracer.operation('div', self, otro)
+
+    __truediv__ = __div__
+
+    def __rdiv__(self, otro):
+        return self.tracer.operation('div', otro, self)
+
+    __rtruediv__ = __rdiv__
+
+    def __pow__(self, exponent):
+        return self.tracer.operation('pow', self, exponent)
+
+    def __rpow__(self, base):
+        return self.tracer.operation('pow', base, self)
+
+    def exp(self):
+        return self.tracer.operation('exp', self)
+
+    def log(self):
+        return self.tracer.operation('log', self)
+
+    def sin(self):
+        return self.tracer.operation('sin', self)
+
+    def cos(self):
+        return self.tracer.operation('cos', self)
+
+    def tan(self):
+        return self.tracer.operation('tan', self)
+
+
+    def __nonzero__(self):
+        raise TypeError("the value of a traced expression is not known while "
+                        "tracing; the function cannot branch on its arguments")
+
+    __bool__ = __nonzero__
+
+    def __contains__(self, x):
+        return self.__nonzero__()
+
+    def _compare(self, otro):
+        return self.__nonzero__()
+
+    # tambi\'en == y !=: si no, comparar\'ian identidades y `if x == 0:` tomar\'ia
+    # la rama False sin avisar
+    __lt__ = __le__ = __gt__ = __ge__ = __eq__ = __ne__ = _compare
+
+    # los nodos se identifican por identidad (el _Tracer ya los reutiliza)
+    __hash__ = object.__hash__
+
+
+class _Tracer(object):
+    """
+    Construye el grafo de una expresi\'on; `nodes` est\'a en orden topol\'ogico
+    (cada nodo aparece despu\'es de sus argumentos)
+    """
+
+    def __init__(self):
+        self.nodes = []
+        self.table = {}
+
+    def _node(self, key, op, args=(), value=None):
+        try:
+            return self.table[key]
+        except KeyError:
+            node = Expression(self, len(self.nodes), op, args, value)
+            self.nodes.append(node)
+            self.table[key] = node
+            return node
+
+    def variable(self, i):
+        return self._node( ('var', i), 'var', value=i )
+
+    def constant(self, value):
+        key = ('const', type(value), value)
+        try:
+            hash(key)
+        except TypeError:     # e.g. an IntervalArray
+            key = ('const', id(value))
+        return self._node( key, 'const', value=value )
+
+    def make_node(self, a):
+        if isinstance(a, Expression):
+            if a.tracer is not self:
+                raise ValueError("expressions from different traces cannot be mixed")
+            return a
+        return self.constant(a)
+
+    def operation(self, op, *args):
+        args = tuple( self.make_node(a) for a in args )
+        if op in _COMMUTATIVE and args[1].index < args[0].index:
+            args = (args[1], args[0])
+
+        if op == 'mul':
+            # x*x -> x**2 and x**n*x -> x**(n+1): a single occurrence of x,
+            # and __pow__ gives the exact range of even powers
+            a, b = args
+            if a is b:
+                return self.operation('pow', a, 2)
+            for (p, q) in [(a, b), (b, a)]:
+                if p.op == 'pow' and p.args[0] is q and _is_natural(p.args[1]):
+                    return self.operation('pow', q, p.args[1].value + 1)
+
+        key = (op,) + tuple( a.index for a in args )
+        return self._node( key, op, args )
+
+
+def _is_natural( node ):
+    return node.op == 'const' and type(node.value) in (int, long) and node.value > 0
+
+
+def trace( fun, num_args=None ):
+    """
+    Eval\'ua fun sobre variables simb\'olicas x0, x1, ...; regresa la lista de
+    variables y el nodo (o la tupla de nodos) resultante
+    """
+    if num_args is None:
+        num_args = len( inspect.getargspec(fun).args )
+
+    tracer = _Tracer()
+    variables = [ tracer.variable(i) for i in range(num_args) ]
+    result = fun(*variables)
+
+    if isinstance(result, tuple):
+        return variables, tuple( tracer.make_node(r) for r in result )
+    return variables, tracer.make_node(result)
+
+
+class CompiledInterval(object):
+    """
+    Funci\'on compilada con `compile_interval`. Se llama igual que la funci\'on
+    original; `source` contiene el c\'odigo generado y `nodes` los nodos del
+    grafo que se eval\'uan, en orden.
+    """
+
+    def __init__(self, fun, num_args=None):
+        self.fun = fun
+        self.variables, self.output = trace( fun, num_args )
+
+        outputs = self.output if isinstance(self.output, tuple) else (self.output,)
+        self.nodes = _reachable( outputs )
+        self.source, namespace = _generate( self.variables, self.nodes, outputs,
+                                            isinstance(self.output, tuple) )
+
+        exec compile(self.source, '<compile_interval>', 'exec') in namespace
+        self.evaluate = namespace['_evaluate']
+
+    @property
+    def num_nodes(self):
+        """N\'umero de operaciones (sin contar variables ni constantes)"""
+        return sum( 1 for node in self.nodes if node.op not in ('var', 'const') )
+
+    def __call__(self, *args):
+        return self.evaluate(*args)
+
+
+def _reachable( outputs ):
+    """Nodos de los que dependen las salidas, en orden topol\'ogico"""
+    needed = set()
+    stack = list(outputs)
+    while stack:
+        node = stack.pop()
+        if node.index not in needed:
+            needed.add(node.index)
+            stack.extend(node.args)
+
+    nodes = outputs[0].tracer.nodes
+    return [ node for node in nodes if node.index in needed ]
+
+def _generate( variables, nodes, outputs, is_tuple ):
+    """C\'odigo fuente del evaluador y el diccionario con sus constantes"""
+    names, namespace = {}, {}
+    for node in variables:
+        names[node.index] = 'x{}'.format(node.value)
+
+    lines = []
+    for node in nodes:
+        if node.op == 'var':
+            continue
+        elif node.op == 'const':
+            name = 'c{}'.format(node.index)
+            namespace[name] = node.value
+        else:
+            name = 't{}'.format(node.index)
+            expr = _TEMPLATES[node.op].format(*[ names[a.index] for a in node.args ])
+            lines.append( '    {} = {}'.format(name, expr) )
+        names[node.index] = name
+
+    result = ', '.join( names[node.index] for node in outputs )
+    if is_tuple:
+        result = '(' + result + ',)'
+
+    header = 'def _evaluate({}):'.format(', '.join( names[v.index] for v in variables ))
+    return '\n'.join( [header] + lines + ['    return ' + result] ) + '\n', namespace
+
+
+def compile_interval( fun, num_args=None ):
+    """
+    Compila fun (una funci\'on de `num_args` argumentos, por omisi\'on los de
+    su definici\'on) en un evaluador plano, p.ej.
+
+        f = compile_interval( lambda x: x*(x - 1) + exp(x*(x - 1)) )
+        f(Intervalo(0, 1)),  f(split_interval_array(x, 1000))
+
+    Las subexpresiones repetidas, como x*(x - 1), se calculan una sola vez.
+    fun s\'olo puede usar operaciones aritm\'eticas y exp, log, sin, cos, tan
+    sobre sus argumentos, sin comparar ni ramificar seg\'un sus valores.
+    """
+    return CompiledInterval( fun, num_args )
+
+
+def _occurrences( variables, output ):
+    """
+    N\'umero de veces que aparece cada variable en la expresi\'on desarrollada
+    como \'arbol (el n\'umero de caminos de la salida a la variable en el grafo)
+    """
+    nodes = _reachable( (output,) )
+    paths = dict( (node.index, 0) for node in nodes )
+    paths[output.index] = 1
+    for node in reversed(nodes):
+        for arg in node.args:
+            paths[arg.index] += paths[node.index]
+
+    return [ paths.get(v.index, 0) for v in variables ]
+
+
+class DependencyAwareInterval(CompiledInterval):
+    """
+    Evaluador (sobre `Intervalo`s) que reduce el problema de dependencia:
+
+    - si cada variable aparece una sola vez, la extensi\'on natural ya da el
+      rango exacto (salvo redondeo) y es lo \'unico que se calcula;
+    - para cada variable repetida se acota la derivada parcial sobre la caja
+      (con `DualInterval`); si no contiene al 0, f es mon\'otona en esa
+      variable y las cotas se obtienen evaluando en el extremo adecuado;
+    - si alguna variable repetida no es mon\'otona, se intersecta adem\'as con la
+      forma del valor medio.
+
+    `occurrences` indica cu\'antas veces aparece cada variable (despu\'es de
+    reescribir x*x como x**2).
+    """
+
+    def __init__(self, fun, num_args=None):
+        CompiledInterval.__init__(self, fun, num_args)
+        if isinstance(self.output, tuple):
+            raise ValueError("dependency-aware evaluation needs a scalar function")
+
+        self.occurrences = _occurrences( self.variables, self.output )
+
+    @property
+    def single_use(self):
+        """True si ninguna variable aparece m\'as de una vez"""
+        return max( self.occurrences + [0] ) <= 1
+
+    def partial_derivative(self, xs, i):
+        """Cota de la derivada parcial respecto a la variable i sobre la caja xs"""
+        args = [ DualInterval(x) for x in xs ]
+        args[i] = DualInterval.variable(xs[i])
+        result = self.evaluate(*args)
+        if not isinstance(result, DualInterval):
+            return xs[i].__class__(0)
+        return result.der
+
+    def __call__(self, *xs):
+        xs = [ x if isinstance(x, Intervalo) else Intervalo(x) for x in xs ]
+        natural = self.evaluate(*xs)
+        if self.single_use:
+            return natural
+
+        lower_args, upper_args = list(xs), list(xs)
+        gradient = {}
+        monotone = True
+        for (i, x) in enumerate(xs):
+            if self.occurrences[i] <= 1:
+                continue
+
+            gradient[i] = der = self.partial_derivative(xs, i)
+            if der.lo >= 0:
+                lower_args[i], upper_args[i] = x.__class__(x.lo), x.__class__(x.hi)
+            elif der.hi <= 0:
+                lower_args[i], upper_args[i] = x.__class__(x.hi), x.__class__(x.lo)
+            else:
+                monotone = False
+
+        result = natural
+        if lower_args != xs:
+            bounds = natural.__class__( self.evaluate(*lower_args).lo,
+                                        self.evaluate(*upper_args).hi )
+            result = result.intersection(bounds)
+
+        if not monotone:
+            c = [ x.__class__(x.mid()) for x in xs ]
+            mean_value = self.evaluate(*c)
+            for (i, x) in enumerate(xs):
+                der = gradient[i] if i in gradient else self.partial_derivative(xs, i)
+                mean_value = mean_value + der * (x - c[i])
+            result = result.intersection(mean_value)
+
+        return result
+
+
+def dependency_aware( fun, num_args=None ):
+    """
+    Compila fun como `compile_interval`, pero el evaluador resultante usa la
+    estructura de la expresi\'on para dar rangos m\'as ajustados sin subdividir
+    (ver `DependencyAwareInterval`), p.ej. para x - x**2 en [2, 3] da el
+    rango exacto [-6, -2] en lugar de [-7, -1].
+    """
+    return DependencyAwareInterval( fun, num_args )
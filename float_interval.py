@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+
+# Intervalos con cotas en punto flotante de doble precisi\'on (float nativo).
+# La contenci\'on se garantiza redondeando hacia afuera cada resultado un ulp,
+# en lugar de usar `mpf` para cada cota. Cuando 53 bits no bastan
+# (mp.dps mayor que 15), se usa `Intervalo` con mpmath.
+
+import math
+import struct
+
+from intervalo import Intervalo, mp, mpf, record_event
+
+
+inf = float('inf')
+
+try:
+    from math import nextafter as _nextafter  # Python >= 3.9
+
+    def next_up(x):
+        return _nextafter(x, inf)
+
+    def next_down(x):
+        return _nextafter(x, -inf)
+
+except ImportError:
+    _double = struct.Struct('<d')
+    _int64 = struct.Struct('<q')
+
+    def next_up(x):
+        """Siguiente float hacia +inf"""
+        if x != x or x == inf:
+            return x
+        if x == 0.0:
+            return 5e-324
+
+        n = _int64.unpack(_double.pack(x))[0]
+        n = n + 1 if n > 0 else n - 1
+        return _double.unpack(_int64.pack(n))[0]
+
+    def next_down(x):
+        """Siguiente float hacia -inf"""
+        return -next_up(-x)
+
+
+def _float_down(a):
+    """Convierte un n\'umero (p.ej. `mpf`, int o str) a float, redondeando hacia abajo"""
+    if type(a) is float:
+        return a
+
+    a = mpf(a, rounding='f')
+    f = float(a)
+    if mpf(f) > a:
+        f = next_down(f)
+    return f
+
+def _float_up(a):
+    """Convierte un n\'umero (p.ej. `mpf`, int o str) a float, redondeando hacia arriba"""
+    if type(a) is float:
+        return a
+
+    a = mpf(a, rounding='c')
+    f = float(a)
+    if mpf(f) < a:
+        f = next_up(f)
+    return f
+
+
+def _eval(fun, x, overflow):
+    """Eval\'ua fun(x); si hay desbordamiento regresa `overflow`"""
+    try:
+        return fun(x)
+    except OverflowError:
+        return overflow
+
+
+def _contains_periodic_point(lo, hi, offset, period):
+    """
+    Verifica si [lo, hi] contiene alg\'un punto offset + k*period; conservador
+    cerca de esos puntos (ver `interval_array._contains_periodic_point`)
+    """
+    n_lo = (lo - offset) / period
+    n_hi = (hi - offset) / period
+    tol = 1e-12 * (1.0 + abs(n_hi))
+    return math.floor(n_hi + tol) >= math.ceil(n_lo - tol)
+
+
+# Funciones mon\'otonas de `math` (ver `Intervalo._monotone`)
+_MONOTONE = {
+    'sqrt': math.sqrt,
+    'asin': math.asin,
+    'acos': math.acos,
+    'atan': math.atan,
+    'sinh': math.sinh,
+    'cosh': math.cosh,
+    'tanh': math.tanh,
+    'expm1': math.expm1,
+    'log1p': lambda x: -inf if x == -1 else math.log1p(x),
+}
+
+
+class FloatInterval(Intervalo):
+    """
+    Intervalo con cotas `float` nativas, redondeadas hacia afuera en cada
+    operaci\'on. Tiene la misma interfaz que `Intervalo`, pero evita crear un
+    `mpf` por cada cota.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, a, b=None):
+        if b is None:  # single argument, so make thin interval
+            b = a
+
+        elif (b < a):
+            a, b = b, a
+
+        self.lo, self.hi = _float_down(a), _float_up(b)
+
+    def make_interval(self, a):
+        if type(a) is FloatInterval:
+            return a
+
+        if isinstance(a, Intervalo):  # e.g. an `Intervalo` with `mpf` bounds
+            return FloatInterval(a.lo, a.hi)
+
+        return FloatInterval(a)
+
+
+    def __add__(self, otro):
+        otro = self.make_interval(otro)
+        return self._from_bounds(next_down(self.lo + otro.lo), next_up(self.hi + otro.hi))
+
+    def __sub__(self, otro):
+        otro = self.make_interval(otro)
+        return self._from_bounds(next_down(self.lo - otro.hi), next_up(self.hi - otro.lo))
+
+    def mult2(self, otro):
+        """
+        Multiplicaci\'on: m\'inimo y m\'aximo de los cuatro productos (0*inf = 0)
+        """
+        if self.lo != self.lo or otro.lo != otro.lo:   # empty
+            return self.empty()
+
+        S = [ self.lo*otro.lo, self.lo*otro.hi,
+              self.hi*otro.lo, self.hi*otro.hi ]
+        S = [ 0.0 if s != s else s for s in S ]
+        return self._from_bounds( next_down(min(S)), next_up(max(S)) )
+
+    mult1 = mult2
+
+    def reciprocal(self):
+        """
+        Rec\'iproco; si el intervalo contiene estrictamente al 0, el resultado
+        es [-inf, inf]
+        """
+        if self.strictly_contains(0):
+            record_event( 'division_by_zero', "Interval {} in denominator contains 0.", self )
+            return self._from_bounds(-inf, inf)
+
+        lower = -inf if self.hi == 0 else next_down(1.0 / self.hi)
+        upper = inf if self.lo == 0 else next_up(1.0 / self.lo)
+        return self._from_bounds(lower, upper)
+
+
+    def exp(self):
+        return self._from_bounds( max(next_down(_eval(math.exp, self.lo, inf)), 0.0),
+                              next_up(_eval(math.exp, self.hi, inf)) )
+
+    def log(self):
+        """
+        Logaritmo; se restringe al dominio natural [0, inf] como `Intervalo.log`
+        """
+        if 0 > self.hi:
+            txt_error = 'Interval {} < 0\nlog(x) cannot be computed '\
+                'for negative numbers.'.format(self)
+            raise ValueError( txt_error )
+
+        if self.lo <= 0:
+            record_event( 'log_domain', "Interval {} contains 0 or negative numbers; "
+                          "restricting to the natural domain of log(x)", self )
+
+        lower = -inf if self.lo <= 0 else next_down(math.log(self.lo))
+        upper = -inf if self.hi == 0 else next_up(math.log(self.hi))
+        return self._from_bounds( lower, upper )
+
+    def _monotone(self, name, increasing=True):
+        """
+        Funci\'on mon\'otona evaluada con `math` en los extremos; como las
+        funciones de `math` no garantizan redondeo correcto, se ensancha un ulp
+        """
+        fun = _MONOTONE[name]
+        a, b = (self.lo, self.hi) if increasing else (self.hi, self.lo)
+        lower = next_down(_eval(fun, a, math.copysign(inf, a)))
+        upper = next_up(_eval(fun, b, math.copysign(inf, b)))
+        if name == 'sqrt':
+            lower = max(lower, 0.0)
+        return self._from_bounds( lower, upper )
+
+    def __pow__(self, exponent):
+        """
+        Potencia; mismos casos que `Intervalo.__pow__`
+        """
+        if isinstance( exponent, Intervalo ):
+            if exponent.lo == exponent.hi:
+                return self**exponent.lo
+
+            return ( exponent*self.log() ).exp()
+
+        power = lambda x: _eval(lambda y: y**exponent, x, inf)
+
+        if exponent == int(exponent):  # exponent is an integer
+            if exponent < 0:
+                return (self**(-exponent)).reciprocal()
+
+            if exponent%2 == 0:  # even exponent
+                return self._from_bounds( max(next_down(power(self.mig())), 0.0),
+                                      next_up(power(self.mag())) )
+
+            # odd exponent
+            return self._from_bounds( next_down(power(self.lo)), next_up(power(self.hi)) )
+
+        # exponent is a generic float
+        if exponent < 0:
+            return (self**(-exponent)).reciprocal()
+
+        if 0 > self.hi:
+            raise ValueError("negative interval can not be raised to a fractional power")
+
+        lower = 0.0 if self.lo <= 0 else max(next_down(power(self.lo)), 0.0)
+        return self._from_bounds( lower, next_up(power(self.hi)) )
+
+
+    def sin(self):
+        """
+        Seno: se eval\'ua en los extremos y se verifica si el intervalo contiene
+        un m\'aximo (pi/2 + 2k pi) o un m\'inimo (-pi/2 + 2k pi)
+        """
+        return self._periodic_minmax(math.sin, 0.5*math.pi, -0.5*math.pi)
+
+    def cos(self):
+        """
+        Coseno: m\'aximos en 2k pi, m\'inimos en pi + 2k pi
+        """
+        return self._periodic_minmax(math.cos, 0.0, math.pi)
+
+    def sincos(self):
+        return self.sin(), self.cos()
+
+    def _periodic_minmax(self, fun, max_offset, min_offset):
+        if self.is_empty():
+            return self
+
+        dospi = 2.0 * math.pi
+        if self.hi - self.lo >= dospi:  # also catches unbounded intervals
+            return self._from_bounds(-1.0, 1.0)
+
+        f_lo, f_hi = fun(self.lo), fun(self.hi)
+        lower = max(next_down(min(f_lo, f_hi)), -1.0)
+        upper = min(next_up(max(f_lo, f_hi)), 1.0)
+
+        if _contains_periodic_point(self.lo, self.hi, max_offset, dospi):
+            upper = 1.0
+        if _contains_periodic_point(self.lo, self.hi, min_offset, dospi):
+            lower = -1.0
+        return self._from_bounds( lower, upper )
+
+    def tan(self):
+        """
+        Tangente: [-inf, inf] si el intervalo contiene un polo (pi/2 + k pi)
+        """
+        if self.is_empty():
+            return self
+
+        if _contains_periodic_point(self.lo, self.hi, 0.5*math.pi, math.pi):
+            return self._from_bounds(-inf, inf)
+
+        return self._from_bounds( next_down(math.tan(self.lo)), next_up(math.tan(self.hi)) )
+
+
+def interval_class():
+    """
+    Regresa la clase de intervalos adecuada para la precisi\'on actual de mpmath:
+    `FloatInterval` si mp.prec <= 53 (doble precisi\'on), `Intervalo` si no.
+    """
+    if mp.prec <= 53:
+        return FloatInterval
+
+    return Intervalo
+
+def interval(a, b=None):
+    """Construye un intervalo con la clase dada por `interval_class()`"""
+    return interval_class()(a, b)
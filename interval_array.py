@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+
+# Arreglos de intervalos: todas las cotas inferiores y superiores se guardan
+# en dos arreglos contiguos de NumPy (float64), y las operaciones se hacen
+# elemento a elemento con redondeo hacia afuera (un ulp con `np.nextafter`).
+
+import numpy as np
+
+from intervalo import Intervalo, mpf
+from float_interval import _float_down, _float_up
+
+
+def _down(x):
+    """Redondea hacia -inf (un ulp)"""
+    return np.nextafter(x, -np.inf)
+
+def _up(x):
+    """Redondea hacia +inf (un ulp)"""
+    return np.nextafter(x, np.inf)
+
+
+def _contains_periodic_point(lo, hi, offset, period):
+    """
+    Verifica (elemento a elemento) si [lo, hi] contiene alg\'un punto de la
+    forma offset + k*period. Es conservador: cerca de esos puntos puede
+    regresar True aunque el punto quede apenas fuera.
+    """
+    n_lo = (lo - offset) / period
+    n_hi = (hi - offset) / period
+    tol = 1e-12 * (1.0 + np.abs(n_hi))
+    return np.floor(n_hi + tol) >= np.ceil(n_lo - tol)
+
+
+class IntervalArray(object):
+    """
+    Arreglo de intervalos con cotas en dos arreglos float64 `lo` y `hi`.
+
+    Implementa la aritm\'etica (+, -, *, /, **) y las funciones elementales
+    (exp, log, sin, cos, tan) elemento a elemento, de modo que se pueden
+    evaluar funciones sobre muchas cajas a la vez. Una entrada con cotas NaN
+    representa un intervalo vac\'io (p.ej. log de un intervalo negativo).
+    """
+
+    # para que `arreglo - x` use x.__rsub__ en lugar de la resta de NumPy
+    __array_priority__ = 1000
+
+    def __init__(self, lo, hi=None):
+        lo = np.asarray(lo, dtype=np.float64)
+        if hi is None:
+            hi = lo
+        else:
+            hi = np.asarray(hi, dtype=np.float64)
+
+        self.lo, self.hi = lo, hi
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        """
+        Construye el arreglo a partir de una lista de `Intervalo`s, redondeando
+        las cotas `mpf` hacia afuera
+        """
+        lo = np.array([_float_down(x.lo) for x in intervals], dtype=np.float64)
+        hi = np.array([_float_up(x.hi) for x in intervals], dtype=np.float64)
+        return cls(lo, hi)
+
+    def to_intervals(self):
+        """Regresa la lista de `Intervalo`s correspondiente"""
+        return [self[i] for i in range(len(self))]
+
+
+    def __repr__(self):
+        return "IntervalArray(lo={}, hi={})".format(repr(self.lo), repr(self.hi))
+
+    def __str__(self):
+        return "\n".join("[{},{}]".format(a, b) for (a, b) in zip(self.lo, self.hi))
+
+    def __len__(self):
+        return len(self.lo)
+
+    def __getitem__(self, index):
+        """
+        Un \'indice entero regresa un `Intervalo` (la conversi\'on de float a
+        `mpf` es exacta); rebanadas y m\'ascaras regresan un `IntervalArray`
+        """
+        lo, hi = self.lo[index], self.hi[index]
+        if np.ndim(lo) == 0:
+            return Intervalo(mpf(float(lo)), mpf(float(hi)))
+
+        return IntervalArray(lo, hi)
+
+
+    # Aritm\'etica elemento a elemento
+    #
+    def __add__(self, otro):
+        otro = self.make_interval_array(otro)
+        return IntervalArray(_down(self.lo + otro.lo), _up(self.hi + otro.hi))
+
+    def __radd__(self, otro):
+        return self + otro
+
+
+    def __sub__(self, otro):
+        otro = self.make_interval_array(otro)
+        return IntervalArray(_down(self.lo - otro.hi), _up(self.hi - otro.lo))
+
+    def __rsub__(self, otro):
+        return -(self - otro)
+
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return IntervalArray(-self.hi, -self.lo)
+
+
+    def __mul__(self, otro):
+        """
+        Multiplicaci\'on: m\'inimo y m\'aximo de los cuatro productos. Los
+        productos 0*inf (que dan NaN) se toman como 0.
+        """
+        otro = self.make_interval_array(otro)
+        empty = np.isnan(self.lo) | np.isnan(otro.lo)
+
+        with np.errstate(invalid='ignore'):
+            S = np.array([ self.lo*otro.lo, self.lo*otro.hi,
+                           self.hi*otro.lo, self.hi*otro.hi ])
+        S[np.isnan(S)] = 0.0
+
+        lo = np.where(empty, np.nan, _down(S.min(axis=0)))
+        hi = np.where(empty, np.nan, _up(S.max(axis=0)))
+        return IntervalArray(lo, hi)
+
+    def __rmul__(self, otro):
+        return self * otro
+
+
+    def reciprocal(self):
+        """
+        Rec\'iproco elemento a elemento; si el intervalo contiene al 0 en su
+        interior, el resultado es [-inf, inf]
+        """
+        with np.errstate(divide='ignore'):
+            lo = np.where(self.hi == 0, -np.inf, _down(1.0 / self.hi))
+            hi = np.where(self.lo == 0, np.inf, _up(1.0 / self.lo))
+
+        zero_inside = (self.lo < 0) & (self.hi > 0)
+        return IntervalArray(np.where(zero_inside, -np.inf, lo),
+                             np.where(zero_inside, np.inf, hi))
+
+    def __div__(self, otro):
+        otro = self.make_interval_array(otro)
+        return self * otro.reciprocal()
+
+    __truediv__ = __div__
+
+    def __rdiv__(self, otro):
+        return self.make_interval_array(otro) * self.reciprocal()
+
+    __rtruediv__ = __rdiv__
+
+
+    def __pow__(self, exponent):
+        """
+        Potencia de un arreglo de intervalos; el exponente puede ser un
+        n\'umero o un intervalo (`Intervalo` o `IntervalArray`)
+        """
+        if isinstance(exponent, (Intervalo, IntervalArray)):
+            exponent = self.make_interval_array(exponent)
+            if np.all(exponent.lo == exponent.hi) and np.ndim(exponent.lo) == 0:
+                return self**float(exponent.lo)
+
+            return (exponent * self.log()).exp()
+
+        if exponent == int(exponent):   # exponent is an integer
+            exponent = int(exponent)
+
+            if exponent == 0:
+                one = np.where(self.is_empty(), np.nan, 1.0)
+                return IntervalArray(one, one)
+
+            elif exponent < 0:
+                return (self**(-exponent)).reciprocal()
+
+            elif exponent % 2 == 0:     # even exponent
+                return IntervalArray(np.maximum(_down(self.mig()**exponent), 0.0),
+                                     _up(self.mag()**exponent))
+
+            else:   # odd exponent
+                return IntervalArray(_down(self.lo**exponent), _up(self.hi**exponent))
+
+        # exponent is a generic float: restrict to the natural domain [0, inf]
+        if exponent < 0:
+            return (self**(-exponent)).reciprocal()
+
+        x = self.intersection(IntervalArray(0.0, np.inf))
+        return IntervalArray(np.maximum(_down(x.lo**exponent), 0.0),
+                             _up(x.hi**exponent))
+
+
+    # Funciones elementales
+    #
+    def exp(self):
+        return IntervalArray(np.maximum(_down(np.exp(self.lo)), 0.0),
+                             _up(np.exp(self.hi)))
+
+    def log(self):
+        """
+        Logaritmo; como en `Intervalo.log`, se restringe al dominio natural
+        [0, inf]. Las entradas completamente negativas quedan vac\'ias.
+        """
+        x = self.intersection(IntervalArray(0.0, np.inf))
+        with np.errstate(divide='ignore'):
+            return IntervalArray(_down(np.log(x.lo)), _up(np.log(x.hi)))
+
+    def sin(self):
+        """
+        Seno: se eval\'ua en los extremos y se verifica si el intervalo contiene
+        un m\'aximo (pi/2 + 2k pi) o un m\'inimo (-pi/2 + 2k pi)
+        """
+        return self._periodic_minmax(np.sin, 0.5*np.pi, -0.5*np.pi)
+
+    def cos(self):
+        """
+        Coseno: m\'aximos en 2k pi, m\'inimos en pi + 2k pi
+        """
+        return self._periodic_minmax(np.cos, 0.0, np.pi)
+
+    def _periodic_minmax(self, fun, max_offset, min_offset):
+        f_lo, f_hi = fun(self.lo), fun(self.hi)
+        lo = _down(np.minimum(f_lo, f_hi))
+        hi = _up(np.maximum(f_lo, f_hi))
+
+        dospi = 2.0 * np.pi
+        hi = np.where(_contains_periodic_point(self.lo, self.hi, max_offset, dospi), 1.0, hi)
+        lo = np.where(_contains_periodic_point(self.lo, self.hi, min_offset, dospi), -1.0, lo)
+        return IntervalArray(np.clip(lo, -1.0, 1.0), np.clip(hi, -1.0, 1.0))
+
+    def tan(self):
+        """
+        Tangente: si el intervalo contiene un polo (pi/2 + k pi) el resultado
+        es [-inf, inf]; si no, la tangente es creciente
+        """
+        lo = _down(np.tan(self.lo))
+        hi = _up(np.tan(self.hi))
+
+        pole = _contains_periodic_point(self.lo, self.hi, 0.5*np.pi, np.pi)
+        lo = np.where(pole, -np.inf, lo)
+        hi = np.where(pole, np.inf, hi)
+        return IntervalArray(lo, hi)
+
+
+    # Operaciones de conjuntos y funciones escalares
+    #
+    def hull(self, otro):
+        """Envoltura elemento a elemento; las entradas vac\'ias se ignoran"""
+        otro = self.make_interval_array(otro)
+        return IntervalArray(np.fmin(self.lo, otro.lo), np.fmax(self.hi, otro.hi))
+
+    def intersection(self, otro):
+        """Intersecci\'on elemento a elemento; las disjuntas quedan vac\'ias (NaN)"""
+        otro = self.make_interval_array(otro)
+        lo = np.maximum(self.lo, otro.lo)
+        hi = np.minimum(self.hi, otro.hi)
+
+        disjoint = lo > hi
+        lo = np.where(disjoint, np.nan, lo)
+        hi = np.where(disjoint, np.nan, hi)
+        return IntervalArray(lo, hi)
+
+    def is_empty(self):
+        """Entradas vac\'ias (con cotas NaN)"""
+        return np.isnan(self.lo)
+
+    def diam(self):
+        return self.hi - self.lo
+
+    def mid(self):
+        return 0.5*(self.lo + self.hi)
+
+    def mag(self):
+        """Distancia m\'axima (magnitude) al origen"""
+        return np.maximum(np.abs(self.lo), np.abs(self.hi))
+
+    def mig(self):
+        """Distancia m\'inima (mignitude) al origen"""
+        mig = np.minimum(np.abs(self.lo), np.abs(self.hi))
+        with np.errstate(invalid='ignore'):     # empty entries stay NaN
+            return np.where((self.lo <= 0) & (self.hi >= 0), 0.0, mig)
+
+    def __abs__(self):
+        return IntervalArray(self.mig(), self.mag())
+
+
+    def make_interval_array(self, a):
+        """
+        Convierte `a` (n\'umero, `mpf`, `Intervalo`, arreglo float64) en un
+        `IntervalArray` (de dimensi\'on 0, que se difunde sobre el arreglo)
+        """
+        if isinstance(a, IntervalArray):
+            return a
+
+        if isinstance(a, Intervalo):
+            return IntervalArray(_float_down(a.lo), _float_up(a.hi))
+
+        if isinstance(a, np.ndarray) and a.dtype == np.float64:   # exact
+            return IntervalArray(a)
+
+        return IntervalArray(_float_down(a), _float_up(a))
+
+
+def split_interval_array( x, num_divisions=1 ):
+    """
+    Divide el intervalo x en n=num_divisions intervalos iguales, regresando
+    un `IntervalArray`; los extremos se redondean hacia afuera para que la
+    uni\'on de las cajas contenga a x
+    """
+    num_divisions = int(num_divisions)
+    if num_divisions < 1:
+        num_divisions = 1
+
+    edge_points = np.linspace(_float_down(x.lo), _float_up(x.hi), num_divisions+1)
+    edge_points[0] = _float_down(x.lo)
+    edge_points[-1] = _float_up(x.hi)
+
+    return IntervalArray(edge_points[:-1], edge_points[1:])
+
+def range_interval_array( fun, boxes ):
+    """
+    Evalua la funci\'on `fun` sobre todas las cajas de `boxes` (un
+    `IntervalArray`) en un solo paso y regresa el hull como `Intervalo`
+    """
+    range_fun = fun(boxes)
+    return Intervalo( mpf(float(np.nanmin(range_fun.lo))),
+                      mpf(float(np.nanmax(range_fun.hi))) )
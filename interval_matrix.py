@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+# Matrices de intervalos y sistemas lineales A x = b con A y b intervalos.
+#
+# Los productos usan la representaci\'on punto medio-radio (Rump): el producto
+# de los puntos medios y las cotas de los radios se calculan con productos de
+# matrices de NumPy (BLAS), en lugar de multiplicar cada par de intervalos.
+# Como NumPy no permite cambiar el modo de redondeo, el error de punto
+# flotante de esos productos se acota a priori (Rump, "Fast interval matrix
+# multiplication", 2012) y se suma al radio.
+
+import numpy as np
+
+from interval_array import IntervalArray, _down, _up
+
+
+_u = 2.0**-53       # unit roundoff
+_eta = 2.0**-1074   # smallest subnormal
+
+
+def _midrad(lo, hi):
+    """Punto medio y radio (redondeado hacia arriba) de los intervalos [lo, hi]"""
+    mid = 0.5*(lo + hi)
+    rad = _up(np.maximum(mid - lo, hi - mid))
+    return mid, rad
+
+def _as_midrad(a):
+    """Punto medio y radio de una matriz/vector de intervalos o de n\'umeros"""
+    if isinstance(a, (IntervalMatrix, IntervalArray)):
+        return _midrad(a.lo, a.hi)
+
+    a = np.asarray(a, dtype=np.float64)
+    return a, np.zeros_like(a)
+
+def _dot(mA, rA, mB, rB):
+    """
+    Producto <mA, rA> * <mB, rB> en representaci\'on punto medio-radio;
+    regresa las cotas inferior y superior del resultado
+    """
+    n = mA.shape[-1]
+    mC = mA.dot(mB)
+
+    abs_mA = np.abs(mA)
+    T = abs_mA.dot(np.abs(mB))
+    R = abs_mA.dot(rB) + rA.dot(np.abs(mB) + rB)
+
+    # error de redondeo de mA*mB y de los productos anteriores
+    gamma = (n + 2) * _u
+    rC = (1 + 4*gamma) * (gamma*T + R) + 2*(n + 1)*_eta
+    return _down(mC - rC), _up(mC + rC)
+
+def interval_dot(A, B):
+    """
+    Producto de matrices (o matriz por vector) donde A y B pueden ser
+    `IntervalMatrix`, `IntervalArray` (vectores) o arreglos de n\'umeros.
+    Regresa un `IntervalMatrix` o, si el resultado es un vector, un
+    `IntervalArray`.
+    """
+    lo, hi = _dot(*(_as_midrad(A) + _as_midrad(B)))
+    if lo.ndim == 2:
+        return IntervalMatrix(lo, hi)
+
+    return IntervalArray(lo, hi)
+
+
+class IntervalMatrix(object):
+    """
+    Matriz de intervalos, con cotas en dos arreglos float64 `lo` y `hi`
+    """
+
+    __array_priority__ = 1000
+
+    def __init__(self, lo, hi=None):
+        lo = np.asarray(lo, dtype=np.float64)
+        if hi is None:
+            hi = lo
+        else:
+            hi = np.asarray(hi, dtype=np.float64)
+
+        self.lo, self.hi = lo, hi
+
+    @classmethod
+    def from_intervals(cls, rows):
+        """Construye la matriz a partir de una lista de renglones de `Intervalo`s"""
+        rows = [ IntervalArray.from_intervals(row) for row in rows ]
+        return cls([ row.lo for row in rows ], [ row.hi for row in rows ])
+
+    @classmethod
+    def identity(cls, n):
+        return cls(np.eye(n))
+
+
+    def __repr__(self):
+        return "IntervalMatrix(lo={}, hi={})".format(repr(self.lo), repr(self.hi))
+
+    @property
+    def shape(self):
+        return self.lo.shape
+
+    def __getitem__(self, index):
+        """Un elemento como `Intervalo`, o un rengl\'on/columna como `IntervalArray`"""
+        return IntervalArray(self.lo, self.hi)[index]
+
+    def mid(self):
+        return _midrad(self.lo, self.hi)[0]
+
+    def rad(self):
+        return _midrad(self.lo, self.hi)[1]
+
+
+    def __add__(self, otro):
+        otro = self.make_interval_matrix(otro)
+        return IntervalMatrix(_down(self.lo + otro.lo), _up(self.hi + otro.hi))
+
+    def __radd__(self, otro):
+        return self + otro
+
+    def __sub__(self, otro):
+        otro = self.make_interval_matrix(otro)
+        return IntervalMatrix(_down(self.lo - otro.hi), _up(self.hi - otro.lo))
+
+    def __rsub__(self, otro):
+        return -(self - otro)
+
+    def __neg__(self):
+        return IntervalMatrix(-self.hi, -self.lo)
+
+    def dot(self, otro):
+        """Producto matricial (ver `interval_dot`)"""
+        return interval_dot(self, otro)
+
+    def make_interval_matrix(self, a):
+        if isinstance(a, IntervalMatrix):
+            return a
+
+        return IntervalMatrix(a)
+
+
+def _interior(X, Y):
+    """Verifica si X est\'a contenido en el interior de Y (vectores)"""
+    return bool(np.all(Y.lo < X.lo) and np.all(X.hi < Y.hi))
+
+def _preconditioner(A):
+    """Inversa aproximada del punto medio de A"""
+    return np.linalg.inv(_as_midrad(A)[0])
+
+
+def initial_enclosure( A, b ):
+    """
+    Caja que contiene todas las soluciones de A x = b (A en A, b en b),
+    x~ + [-beta, beta] con x~ = C mid(b), C ~ mid(A)^-1 y
+        beta = ||C (A x~ - b)|| / (1 - ||I - C A||)   (norma infinito),
+    v\'alida si ||I - C A|| < 1. Regresa None si no es el caso.
+    """
+    C = _preconditioner(A)
+    xt = C.dot(_as_midrad(b)[0])
+
+    E = interval_dot(C, A)
+    E = IntervalMatrix.identity(len(xt)) - E
+    norm_E = _up(np.maximum(np.abs(E.lo), np.abs(E.hi)).sum(axis=1).max())
+    if not norm_E < 1:
+        return None
+
+    residual = interval_dot(C, interval_dot(A, xt) - b)
+    beta = _up(np.maximum(np.abs(residual.lo), np.abs(residual.hi)).max() / _down(1 - norm_E))
+    return IntervalArray(_down(xt - beta), _up(xt + beta))
+
+
+def gauss_seidel( A, b, X=None, max_iter=20, tol=1e-15 ):
+    """
+    M\'etodo de Gauss-Seidel por intervalos, precondicionado con
+    C ~ mid(A)^-1: con M = C A y r = C b, para cada componente
+        x_i <- ( r_i - sum_{j != i} M_ij x_j ) / M_ii  intersectado con x_i.
+    X es una caja inicial (`IntervalArray`) que contiene a las soluciones
+    buscadas; por omisi\'on se usa `initial_enclosure`. Regresa la caja
+    contra\'ida (con entradas NaN si se demuestra que X no contiene soluciones).
+    """
+    if X is None:
+        X = initial_enclosure(A, b)
+        if X is None:
+            raise ValueError("mid(A) is too ill-conditioned to find an initial enclosure")
+
+    C = _preconditioner(A)
+    mM, rM = _as_midrad( interval_dot(C, A) )
+    r = interval_dot(C, b)
+    lo, hi = X.lo.copy(), X.hi.copy()
+
+    for iteration in range(max_iter):
+        old_width = (hi - lo).max()
+
+        for i in range(len(lo)):
+            mrow, rrow = mM[i].copy(), rM[i].copy()
+            mrow[i] = rrow[i] = 0.0
+            s_lo, s_hi = _dot(mrow, rrow, *_midrad(lo, hi))
+
+            xi = (r[i:i+1] - IntervalArray(s_lo, s_hi)) / IntervalArray(mM[i, i] - rM[i, i], mM[i, i] + rM[i, i])
+            xi = xi.intersection(IntervalArray(lo[i], hi[i]))
+            lo[i], hi[i] = xi.lo, xi.hi
+
+        if np.isnan(lo).any():
+            return IntervalArray(np.nan*lo, np.nan*hi)
+
+        if old_width - (hi - lo).max() <= tol * old_width:
+            break
+
+    return IntervalArray(lo, hi)
+
+
+def krawczyk( A, b, X, xt=None, C=None ):
+    """
+    Operador de Krawczyk para A x = b sobre la caja X:
+        K(X) = x~ - C (A x~ - b) + (I - C A)(X - x~),
+    con x~ ~ soluci\'on aproximada y C ~ mid(A)^-1. Si K(X) est\'a en el
+    interior de X, cada sistema A x = b (A en A, b en b) tiene soluci\'on
+    \'unica, y \'esta est\'a en K(X).
+    """
+    if C is None:
+        C = _preconditioner(A)
+    if xt is None:
+        xt = C.dot(_as_midrad(b)[0])
+
+    E = IntervalMatrix.identity(len(xt)) - interval_dot(C, A)
+    residual = interval_dot(C, interval_dot(A, xt) - b)
+    return (xt - residual) + interval_dot(E, X - xt)
+
+def krawczyk_solve( A, b, max_iter=20, tol=1e-15 ):
+    """
+    Soluci\'on verificada de A x = b. Empieza con una caja alrededor de la
+    soluci\'on aproximada x~ = C mid(b) (inflada si es necesario) e itera
+    X <- K(X) intersectado con X. Regresa (X, verified): si verified es True,
+    toda soluci\'on de A x = b con A en A, b en b existe, es \'unica y est\'a en X.
+    """
+    C = _preconditioner(A)
+    xt = C.dot(_as_midrad(b)[0])
+
+    X = initial_enclosure(A, b)
+    if X is None:
+        return None, False
+
+    # epsilon-inflation, para poder verificar K(X) en el interior de X
+    radius = 0.1*(X.hi - X.lo) + 1e-300
+    X = IntervalArray(_down(X.lo - radius), _up(X.hi + radius))
+
+    verified = False
+    for iteration in range(max_iter):
+        K = krawczyk( A, b, X, xt, C )
+        verified = verified or _interior(K, X)
+
+        new_X = K.intersection(X)
+        old_width = (X.hi - X.lo).max()
+        X = new_X
+        if old_width - (X.hi - X.lo).max() <= tol * old_width:
+            break
+
+    return X, verified
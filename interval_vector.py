@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# Cajas (vectores de intervalos) en n dimensiones. Las cotas se guardan en dos
+# arreglos de NumPy de forma (n,) para una caja, o (N, n) para un lote de N
+# cajas, de modo que una funci\'on de varias variables se eval\'ua sobre todas
+# las cajas a la vez usando `IntervalArray`.
+
+import itertools
+
+import numpy as np
+
+from intervalo import Intervalo
+from interval_array import IntervalArray, range_interval_array
+from float_interval import _float_down, _float_up
+
+
+class IntervalVector(object):
+    """
+    Caja [lo_1, hi_1] x ... x [lo_n, hi_n], o un lote de cajas (la \'ultima
+    dimensi\'on de `lo` y `hi` recorre las componentes).
+
+    `X[i]` es la componente i como `IntervalArray` (sobre todo el lote), as\'i
+    que una funci\'on f(X) = X[0]*X[1] + sin(X[2]) se eval\'ua vectorialmente.
+    Las entradas con cotas NaN son vac\'ias.
+    """
+
+    def __init__(self, lo, hi=None):
+        lo = np.asarray(lo, dtype=np.float64)
+        if hi is None:
+            hi = lo
+        else:
+            hi = np.asarray(hi, dtype=np.float64)
+
+        self.lo, self.hi = lo, hi
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        """Caja con componentes dadas por una lista de `Intervalo`s"""
+        lo = [ _float_down(x.lo) for x in intervals ]
+        hi = [ _float_up(x.hi) for x in intervals ]
+        return cls(lo, hi)
+
+    def to_intervals(self):
+        """Lista de `Intervalo`s con las componentes de una sola caja"""
+        return IntervalArray(self.lo, self.hi).to_intervals()
+
+
+    def __repr__(self):
+        return "IntervalVector(lo={}, hi={})".format(repr(self.lo), repr(self.hi))
+
+    @property
+    def dim(self):
+        """N\'umero de componentes n"""
+        return self.lo.shape[-1]
+
+    @property
+    def num_boxes(self):
+        """N\'umero de cajas del lote (1 para una sola caja)"""
+        return 1 if self.lo.ndim == 1 else self.lo.shape[0]
+
+    def __len__(self):
+        return self.dim
+
+    def __getitem__(self, i):
+        """Componente i (sobre todo el lote), como `IntervalArray`"""
+        return IntervalArray(self.lo[..., i], self.hi[..., i])
+
+    def box(self, k):
+        """La caja k del lote"""
+        return IntervalVector(self.lo[k], self.hi[k])
+
+
+    # Funciones escalares de cajas (ver Tucker / Moore)
+    def widths(self):
+        """Anchos de las componentes"""
+        return self.hi - self.lo
+
+    def diam(self):
+        """Di\'ametro de la caja: el m\'aximo ancho de sus componentes"""
+        return self.widths().max(axis=-1)
+
+    def mid(self):
+        return 0.5*(self.lo + self.hi)
+
+    def hull(self, otro):
+        """Envoltura de dos cajas (componente a componente)"""
+        return IntervalVector(np.fmin(self.lo, otro.lo), np.fmax(self.hi, otro.hi))
+
+    def intersection(self, otro):
+        """
+        Intersecci\'on de dos cajas; si es vac\'ia en alguna componente, toda la
+        caja queda vac\'ia (NaN)
+        """
+        lo = np.maximum(self.lo, otro.lo)
+        hi = np.minimum(self.hi, otro.hi)
+
+        empty = (lo > hi).any(axis=-1)[..., np.newaxis]
+        lo = np.where(empty, np.nan, lo)
+        hi = np.where(empty, np.nan, hi)
+        return IntervalVector(lo, hi)
+
+    def is_empty(self):
+        return np.isnan(self.lo).any(axis=-1)
+
+
+def split_box( X, dim=None ):
+    """
+    Bisecta cada caja de X a lo largo de la componente `dim`, o de su
+    componente m\'as ancha si dim es None. Regresa un lote con el doble de
+    cajas: primero todas las mitades inferiores, luego las superiores.
+    """
+    lo = np.atleast_2d(X.lo)
+    hi = np.atleast_2d(X.hi)
+    rows = np.arange(lo.shape[0])
+
+    if dim is None:
+        dim = np.argmax(hi - lo, axis=-1)
+
+    m = 0.5*(lo[rows, dim] + hi[rows, dim])
+    lo2, hi1 = lo.copy(), hi.copy()
+    hi1[rows, dim] = m
+    lo2[rows, dim] = m
+
+    return IntervalVector(np.concatenate([lo, lo2]), np.concatenate([hi1, hi]))
+
+def split_box_uniform( X, num_divisions=1 ):
+    """
+    Divide una caja en num_divisions partes iguales en cada componente
+    (`num_divisions` puede ser un entero o una lista, una por componente).
+    Regresa el lote de todas las subcajas.
+    """
+    num_divisions = np.broadcast_to(num_divisions, (X.dim,))
+    edges = []
+    for (lo, hi, num) in zip(X.lo, X.hi, num_divisions):
+        edge_points = np.linspace(lo, hi, max(int(num), 1) + 1)
+        edge_points[0], edge_points[-1] = lo, hi
+        edges.append(edge_points)
+
+    index = np.array(list(itertools.product(*[ range(len(e) - 1) for e in edges ])))
+    lo = np.array([ e[index[:, i]] for (i, e) in enumerate(edges) ]).T
+    hi = np.array([ e[index[:, i] + 1] for (i, e) in enumerate(edges) ]).T
+    return IntervalVector(lo, hi)
+
+def range_interval_box( fun, boxes ):
+    """
+    Versi\'on multidimensional de `range_interval_f`: eval\'ua `fun` sobre
+    todas las cajas del lote en un solo paso y regresa el hull como `Intervalo`
+    """
+    return range_interval_array( fun, boxes )
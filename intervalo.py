@@ -1,12 +1,26 @@
 # -*- coding: utf-8 -*-
 
 # Usamos mpmath para las funciones elementales (exp, log, sin, cos, tan, etc)
-# para adem\'as poder usar precisi\'on extendida
-
-from sympy.mpmath import mp, mpf
-from matplotlib import pyplot as plt
+# para adem\'as poder usar precisi\'on extendida. Se prefiere el paquete
+# mpmath independiente: sympy.mpmath obliga a importar todo sympy. Las
+# gr\'aficas est\'an en plotting.py, que (con matplotlib) se importa s\'olo
+# al dibujar.
+
+import warnings
+from collections import OrderedDict, namedtuple
+
+try:
+    from mpmath import mp, mpf
+except ImportError:
+    from sympy.mpmath import mp, mpf
 import numpy as np
 
+def _product(a, b):
+    """a*b con 0*inf = 0: el NaN de mpf se confundir\'ia con el intervalo vac\'io"""
+    p = a*b
+    return p if p == p else mpf(0)
+
+
 class Intervalo(object):
     """
     Se define la clase 'Intervalo', y la aritm\'etica b\'asica de intervalos, 
@@ -16,6 +30,8 @@ class Intervalo(object):
     elementales y poder usar precisi\'on extendida de manera sencilla.
     """
 
+    __slots__ = ('lo', 'hi')
+
     def __init__(self, a, b=None):
         """ 
         Se define la clase 'Intervalo', y los m\'etodos para la aritm\'etica 
@@ -35,6 +51,21 @@ class Intervalo(object):
         b = make_mpf(b)
 
         self.lo, self.hi = a, b
+
+    @classmethod
+    def _from_bounds(cls, lo, hi):
+        """
+        Constructor interno para los resultados de las operaciones: no
+        verifica el orden ni convierte las cotas, que deben ser ya `mpf`
+        (o del tipo de la subclase) con lo <= hi.
+        """
+        interval = _new_object(cls)
+        interval.lo, interval.hi = lo, hi
+        return interval
+
+    def __reduce__(self):
+        # necesario para pickle, pues la clase usa __slots__
+        return (self.__class__, (self.lo, self.hi))
             
 
     # Lo siguiente sirve para dar informaci\'on bonita del objeto `Intervalo`
@@ -43,8 +74,25 @@ class Intervalo(object):
         return "Intervalo [{},{}]".format(repr(self.lo),repr(self.hi))
     
     def __str__(self):
+        if self.is_empty():
+            return "[empty]"
         return "[{},{}]".format(self.lo,self.hi)
 
+    @classmethod
+    def empty(cls):
+        """
+        El intervalo vac\'io, con cotas NaN (uno por clase). Se propaga en la
+        aritm\'etica y las funciones elementales: el resultado es vac\'io.
+        """
+        try:
+            return _empty_intervals[cls]
+        except KeyError:
+            value = _empty_intervals[cls] = cls(mpf('nan'))
+            return value
+
+    def is_empty(self):
+        return self.lo != self.lo   # NaN
+
 
     # Aqu\'i vienen las operaciones aritm\'eticas y varias funciones
     #
@@ -54,7 +102,7 @@ class Intervalo(object):
         """
 
         otro = self.make_interval(otro)
-        return Intervalo(self.lo + otro.lo, self.hi + otro.hi)
+        return self._from_bounds(self.lo + otro.lo, self.hi + otro.hi)
         
     def __radd__(self, otro):
         return self + otro
@@ -66,7 +114,7 @@ class Intervalo(object):
         """
 
         otro = self.make_interval(otro)
-        return Intervalo( self.lo - otro.hi, self.hi - otro.lo )
+        return self._from_bounds( self.lo - otro.hi, self.hi - otro.lo )
         
     def __rsub__(self, otro):
         return -(self - otro)
@@ -79,7 +127,7 @@ class Intervalo(object):
         """
         El negativo de un intervalo
         """
-        return Intervalo(-self.hi,-self.lo)
+        return self._from_bounds(-self.hi,-self.lo)
     
 
     def __mul__(self, otro):
@@ -96,36 +144,42 @@ class Intervalo(object):
 
     def mult1(self,otro):
         """ Algor\'itmo de la multiplicaci\'on ingenuo """
-        S = [ self.lo*otro.lo, self.lo*otro.hi, 
-              self.hi*otro.lo, self.hi*otro.hi ]
-        return Intervalo( min(S), max(S) )
+        if self.is_empty() or otro.is_empty():
+            return self.empty()
+
+        S = [ _product(self.lo, otro.lo), _product(self.lo, otro.hi),
+              _product(self.hi, otro.lo), _product(self.hi, otro.hi) ]
+        return self._from_bounds( min(S), max(S) )
 
     def mult2(self,otro):
         """
         Algor\'itmo de la multiplicaci\'on que distingue los nueve casos posibles
         """
+        if self.is_empty() or otro.is_empty():
+            return self.empty()
+
         if (self.lo >= 0.0 and otro.lo >= 0.0):
-            return Intervalo( self.lo*otro.lo, self.hi*otro.hi )
+            return self._from_bounds( _product(self.lo, otro.lo), _product(self.hi, otro.hi) )
         elif (self.hi < 0.0 and otro.hi < 0.0):
-            return Intervalo( self.hi*otro.hi, self.lo*otro.lo )
+            return self._from_bounds( _product(self.hi, otro.hi), _product(self.lo, otro.lo) )
         elif (self.lo >= 0.0 and otro.hi < 0.0):
-            return Intervalo( self.lo*otro.hi, self.hi*otro.lo )
+            return self._from_bounds( _product(self.hi, otro.lo), _product(self.lo, otro.hi) )
         elif (self.hi < 0.0 and otro.lo >= 0.0):
-            return Intervalo( self.hi*otro.lo, self.lo*otro.hi )
+            return self._from_bounds( _product(self.lo, otro.hi), _product(self.hi, otro.lo) )
         elif (self.lo >= 0.0 and otro.lo*otro.hi < 0.0):
-            return Intervalo( self.hi*otro.lo, self.hi*otro.hi )
+            return self._from_bounds( _product(self.hi, otro.lo), _product(self.hi, otro.hi) )
         elif (self.hi < 0.0 and otro.lo*otro.hi < 0.0):
-            return Intervalo( self.lo*otro.hi, self.lo*otro.lo )
+            return self._from_bounds( _product(self.lo, otro.hi), _product(self.lo, otro.lo) )
         elif (otro.lo >= 0.0 and self.lo*self.hi < 0.0):
-            return Intervalo( self.lo*otro.hi, self.hi*otro.hi )
+            return self._from_bounds( _product(self.lo, otro.hi), _product(self.hi, otro.hi) )
         elif (otro.hi < 0.0 and self.lo*self.hi < 0.0):
-            return Intervalo( self.hi*otro.lo, self.lo*otro.lo )
+            return self._from_bounds( _product(self.hi, otro.lo), _product(self.lo, otro.lo) )
 
         else: #(self.lo*self.hi < 0.0 and otro.lo*otro.hi < 0.0):
 
-            S1 = [ self.lo*otro.lo, self.hi*otro.hi ]
-            S2 = [ self.hi*otro.lo, self.lo*otro.hi ]
-            return Intervalo( min(S2), max(S1) )
+            S1 = [ _product(self.lo, otro.lo), _product(self.hi, otro.hi) ]
+            S2 = [ _product(self.hi, otro.lo), _product(self.lo, otro.hi) ]
+            return self._from_bounds( min(S2), max(S1) )
 
 
     def __div__(self, otro):
@@ -133,17 +187,54 @@ class Intervalo(object):
         Divisi\'on de intervalos: producto del primero por el rec\'iproco del segundo
         """
         otro = self.make_interval(otro)
-
-        try:
-            return self * otro.reciprocal()
-        except ZeroDivisionError:
-            print "To divide by an interval containining 0, we need to implement extended intervals!"
-            # put extended interval code here
+        return self * otro.reciprocal()
 
     def __rdiv__(self, otro):
         # Esto se encarga de cosas tipo numero/intervalo; self es el intervalo
         return (self / otro).reciprocal()
 
+    def extended_division(self, otro):
+        """
+        Divisi\'on extendida (Kahan, Hickey et al.): el conjunto
+        {x/y : x en self, y en otro, y != 0} como `MultiInterval`. Si el
+        divisor contiene al 0 y el dividendo no, son una o dos piezas no
+        acotadas, p.ej. [1, 2] / [-1, 1] = [-inf, -1] U [1, inf], en lugar
+        del [-inf, inf] de la divisi\'on usual. Si otro = [0, 0] es vac\'io.
+        """
+        from multi_interval import MultiInterval
+
+        otro = self.make_interval(otro)
+        if self.is_empty() or otro.is_empty():
+            return MultiInterval([])
+        if 0 not in otro:
+            return MultiInterval([ self / otro ])
+
+        C = self.__class__
+        inf = mpf('inf')
+        if otro.lo == 0 and otro.hi == 0:
+            return MultiInterval([])
+        if self.lo == 0 and self.hi == 0:   # 0/y = 0 para todo y != 0
+            return MultiInterval([ C(0) ])
+        if 0 in self:
+            return MultiInterval([ C(-inf, inf) ])
+
+        # pieces from the positive (0, hi] and negative [lo, 0) parts of otro,
+        # using the endpoint of self closest to 0
+        quotient = lambda a, b: C(a) / C(b)
+        pieces = []
+        if self.hi < 0:
+            if otro.hi > 0:
+                pieces.append( C(-inf, quotient(self.hi, otro.hi).hi) )
+            if otro.lo < 0:
+                pieces.append( C(quotient(self.hi, otro.lo).lo, inf) )
+        else:
+            if otro.hi > 0:
+                pieces.append( C(quotient(self.lo, otro.hi).lo, inf) )
+            if otro.lo < 0:
+                pieces.append( C(-inf, quotient(self.lo, otro.lo).hi) )
+
+        return MultiInterval(pieces)
+
 
     def __contains__(self, x):
         """
@@ -171,13 +262,28 @@ class Intervalo(object):
             upper = mpf("inf")
 
         if self.strictly_contains(0):
-            txt_error = "Interval {} in denominator contains 0.".format(self)
-            #raise ZeroDivisionError( txt_error )
+            record_event( 'division_by_zero', "Interval {} in denominator contains 0.", self )
             lower = - mpf("inf")
             upper = mpf("inf")
 
         #return Intervalo( 1.0/self.hi, 1.0/self.lo )
-        return Intervalo(lower, upper)
+        return self._from_bounds(lower, upper)
+
+    def extended_reciprocal(self):
+        """
+        Rec\'iproco extendido: regresa una lista de intervalos cuya uni\'on
+        contiene a {1/y : y en self, y != 0}. Si el intervalo contiene
+        estrictamente al 0, son dos piezas, [-inf, 1/lo] y [1/hi, inf];
+        para [0,0] la lista es vac\'ia.
+        """
+        if self.lo == 0 and self.hi == 0:
+            return []
+
+        if not self.strictly_contains(0):
+            return [ self.reciprocal() ]
+
+        return [ self.__class__(self.lo, 0).reciprocal(),
+                 self.__class__(0, self.hi).reciprocal() ]
 
     
     # pow, rpow, abs, sin, cos, ...
@@ -186,7 +292,7 @@ class Intervalo(object):
         """
         Exponencial de un intervalo: 'self.exp()'
         """
-        return Intervalo( mp.exp(self.lo), mp.exp(self.hi) )
+        return self._from_bounds( _mp_eval('exp', self.lo), _mp_eval('exp', self.hi) )
 
     def log(self):
         """
@@ -202,14 +308,11 @@ class Intervalo(object):
             domainNatural = Intervalo( 0, mpf('inf') )
             intervalRestricted = self.intersection( domainNatural )
 
-            txt_warning = "\nWARNING: Interval {} contains 0 or negative numbers.\n".format(self)
-            print txt_warning
-            
-            txt_warning = "Restricting to the intersection "\
-                "with the natural domain of log(x), i.e. {}\n".format(intervalRestricted)
-            print txt_warning
-            
-            return Intervalo( mp.log(intervalRestricted.lo), mp.log(intervalRestricted.hi) )
+            record_event( 'log_domain', "Interval {} contains 0 or negative numbers; "
+                          "restricting to the natural domain of log(x), i.e. {}",
+                          self, intervalRestricted )
+
+            return self._from_bounds( _mp_eval('log', intervalRestricted.lo), _mp_eval('log', intervalRestricted.hi) )
 
         elif 0 > self.hi:
             txt_error = 'Interval {} < 0\nlog(x) cannot be computed '\
@@ -217,7 +320,7 @@ class Intervalo(object):
             raise ValueError( txt_error )
 
         else:
-            return Intervalo( mp.log(self.lo), mp.log(self.hi) )
+            return self._from_bounds( _mp_eval('log', self.lo), _mp_eval('log', self.hi) )
 
 
     def __pow__(self, exponent):
@@ -225,6 +328,9 @@ class Intervalo(object):
         Se calcula la potencia de un intervalo; operador '**'
         UNDER TESTING
         """
+        if self.is_empty():
+            return self
+
         if isinstance( exponent, Intervalo ): # exponent is an interval
 
             if exponent.lo == exponent.hi: # exponent is a thin interval
@@ -239,10 +345,10 @@ class Intervalo(object):
 
                 if exponent >= 0:
                     if exponent%2 == 0:  # even exponent
-                        return Intervalo( (self.mig())**exponent, (self.mag())**exponent )
+                        return self._from_bounds( self.mig()**exponent, self.mag()**exponent )
 
                     else:  # odd exponent
-                        return Intervalo( self.lo**exponent, self.hi**exponent )
+                        return self._from_bounds( self.lo**exponent, self.hi**exponent )
 
                 else:   # exponent < 0
                     return (self**(-exponent)).reciprocal()
@@ -251,152 +357,163 @@ class Intervalo(object):
                 # exponent is a generic float
                 if exponent >= 0:
                     if 0 in self:
-                        domainNatural = Intervalo( 0, mpf('inf') )
+                        domainNatural = self.__class__( 0, mpf('inf') )
                         intervalRestricted = self.intersection( domainNatural )
 
-                        txt_warning = "\nWARNING: Interval {} contains 0.\n".format(self)
-                        print txt_warning
-
-                        txt_warning = "Restricting to the intersection "\
-                              "with the natural domain of **, i.e. {}\n".format(intervalRestricted)
-                        print txt_warning
+                        record_event( 'pow_domain', "Interval {} contains 0; restricting to "
+                                      "the natural domain of **, i.e. {}",
+                                      self, intervalRestricted )
 
-                        return Intervalo( 0, self.hi**exponent )
+                        return self._from_bounds( type(self.hi)(0), self.hi**exponent )
 
                     elif 0 > self:
                         raise ValueError("negative interval can not be raised to a fractional power")
 
                     else:
-                        return Intervalo( self.lo**exponent, self.hi**exponent )
+                        return self._from_bounds( self.lo**exponent, self.hi**exponent )
 
                 else:
                     return (self**(-exponent)).reciprocal()
 
     def __rpow__(self,exponent):
-        return Intervalo(exponent)**self
+        return self.__class__(exponent)**self
 
 
-    def sin(self):
+    def _quadrants(self):
         """
-        Se calcula el seno de un intervalo
-        TEST CAREFULLY
+        Cuadrantes (ver `_quadrant`) de los extremos del intervalo, o None si
+        alg\'un extremo es infinito
         """
-        pi = mp.pi
-        pi_half = 0.5 * pi
-        dospi = 2.0 * pi
-        xlow, xhig = self.lo, self.hi
-        whole_range = Intervalo(-1,1)
+        if not (mp.isfinite(self.lo) and mp.isfinite(self.hi)):
+            return None
+        return _quadrant(self.lo), _quadrant(self.hi)
 
-        # Check the specific case:
-        if xhig > xlow + dospi: # more than 1 full period away
-            return whole_range
-        
-        else: # within 1 full period of sin(x); 20 cases
-            # some abreviations
-            lo_mod2pi = xlow % dospi
-            hi_mod2pi = xhig % dospi
-            sin_xlo = mp.sin( xlow )
-            sin_xhi = mp.sin( xhig )
-            lo_quarter = mp.floor( lo_mod2pi / pi_half )
-            hi_quarter = mp.floor( hi_mod2pi / pi_half )
-                
-            if lo_quarter == hi_quarter: # mismo cuadrante --> 8 casos
-
-                if lo_mod2pi <= hi_mod2pi:
-                    return Intervalo( sin_xlo, sin_xhi )
-                else:
-                    return whole_range
+    def _periodic_range(self, quadrants, name, max_boundary):
+        """
+        Rango de sin o cos (`name`) sobre el intervalo. El m\'aximo 1 se alcanza
+        en los m\'ultiplos b*pi/2 con b = max_boundary (mod 4), y el m\'inimo -1
+        en b = max_boundary + 2 (mod 4); los m\'ultiplos dentro del intervalo
+        son los de q_lo < b <= q_hi. Fuera de ellos, la funci\'on es mon\'otona
+        y los extremos del rango est\'an en lo y hi.
+        """
+        if quadrants is None or quadrants[1] - quadrants[0] >= 4:
+            if self.is_empty():
+                return self
+            return self._from_bounds( _minus_one, _one )
 
-            else:
-                # other abreviations
-                min_sin, max_sin = sin_xlo, sin_xhi
-                if sin_xhi < sin_xlo:
-                    min_sin, max_sin = sin_xhi, sin_xlo
-                
-                if ( lo_quarter == 3 and hi_quarter==0 ) or \
-                ( lo_quarter == 1 and hi_quarter==2 ) : # 2 cases
-                    return Intervalo( sin_xlo, sin_xhi )
-                
-                elif ( lo_quarter == 0 or lo_quarter==3 ) and \
-                ( hi_quarter==1 or hi_quarter==2 ) : # 4 cases
-                    return Intervalo( min_sin, 1 )
-                
-                elif ( lo_quarter == 1 or lo_quarter==2 ) and \
-                ( hi_quarter==3 or hi_quarter==0 ) : # 4 cases
-                    return Intervalo( -1, max_sin )
-                
-                elif ( lo_quarter == 0 and hi_quarter==3 ) or \
-                ( lo_quarter == 2 and hi_quarter==1 ) : # 2 cases
-                    return whole_range
-                
-                else: # This should be never reached!
-                    raise NotImplementedError( 'SOMETHING WENT WRONG. This should have never\
-                        been reached' )
+        f_lo, f_hi = _mp_eval( name, self.lo ), _mp_eval( name, self.hi )
+        lo, hi = min(f_lo, f_hi), max(f_lo, f_hi)
+
+        boundaries = [ b % 4 for b in range(quadrants[0] + 1, quadrants[1] + 1) ]
+        if max_boundary in boundaries:
+            hi = _one
+        if (max_boundary + 2) % 4 in boundaries:
+            lo = _minus_one
 
+        return self._from_bounds( lo, hi )
+
+    def sin(self):
+        """
+        Se calcula el seno de un intervalo
+        """
+        return self._periodic_range( self._quadrants(), 'sin', 1 )
 
     def cos(self):
         """
         Se calcula el coseno de un intervalo
-        TEST CAREFULLY
         """
-        pi = mp.pi
-        pi_half = 0.5 * pi
-        dospi = 2.0 * pi
-        xlow, xhig = self.lo, self.hi
-        whole_range = Intervalo(-1,1)
+        return self._periodic_range( self._quadrants(), 'cos', 0 )
 
-        # Check the specific case:
-        if xhig > xlow + dospi: # more than 1 full period away
-            return whole_range
-        
-        else: # within 1 full period of sin(x); 20 cases
-            # some abreviations
-            lo_mod2pi = xlow % dospi
-            hi_mod2pi = xhig % dospi
-            lo_quarter = mp.floor( lo_mod2pi / pi_half )
-            hi_quarter = mp.floor( hi_mod2pi / pi_half )
-            cos_xlo = mp.cos( xlow )
-            cos_xhi = mp.cos( xhig )
-                
-            if lo_quarter == hi_quarter: # mismo cuadrante --> 8 casos
-
-                if lo_mod2pi <= hi_mod2pi:
-                    return Intervalo( cos_xlo, cos_xhi )
-                else:
-                    return whole_range
+    def sincos(self):
+        """
+        Regresa (sin(self), cos(self)), reduciendo cada extremo una sola vez
+        """
+        quadrants = self._quadrants()
+        return ( self._periodic_range( quadrants, 'sin', 1 ),
+                 self._periodic_range( quadrants, 'cos', 0 ) )
 
-            else:
-                # other abreviations                
-                min_cos, max_cos = cos_xlo, cos_xhi
-                if cos_xhi < cos_xlo:
-                    min_cos, max_cos = cos_xhi, cos_xlo
-
-                if ( lo_quarter == 2 and hi_quarter==3 ) or \
-                ( lo_quarter == 0 and hi_quarter==1 ) : # 2 cases
-                    return Intervalo( cos_xlo, cos_xhi )
-                
-                elif ( lo_quarter == 2 or lo_quarter==3 ) and \
-                ( hi_quarter==0 or hi_quarter==1 ) : # 4 cases
-                    return Intervalo( min_cos, 1 )
-                
-                elif ( lo_quarter == 0 or lo_quarter==1 ) and \
-                ( hi_quarter==2 or hi_quarter==3 ) : # 4 cases
-                    return Intervalo( -1, max_cos )
-                
-                elif ( lo_quarter == 3 and hi_quarter==2 ) or \
-                ( lo_quarter == 1 and hi_quarter==0 ) : # 2 cases
-                    return whole_range
-                
-                else: # This should be never reached!
-                    raise NotImplementedError( 'SOMETHING WENT WRONG. This should have never\
-                        been reached' )
+    def tan(self):
+        """
+        Se calcula la tangente de un intervalo: si contiene un polo
+        (2k+1)*pi/2, es decir un m\'ultiplo impar de pi/2, el resultado es toda
+        la recta; si no, tan es creciente en el intervalo
+        """
+        quadrants = self._quadrants()
+        if quadrants is None or quadrants[1] - quadrants[0] >= 2 or \
+                ( quadrants[1] != quadrants[0] and quadrants[1] % 2 ):
+            if self.is_empty():
+                return self
+            return self._from_bounds( mpf('-inf'), mpf('inf') )
 
+        return self._from_bounds( _mp_eval( 'tan', self.lo ), _mp_eval( 'tan', self.hi ) )
 
-    def tan(self):
+
+    # Funciones mon\'otonas: basta evaluar en los extremos
+    def _monotone(self, name, increasing=True):
         """
-        Se calcula la tangente de un intervalo
+        Aplica la funci\'on mon\'otona `name` (de mpmath) a los extremos
         """
-        return self.sin() / self.cos()
+        lower, upper = _mp_eval( name, self.lo ), _mp_eval( name, self.hi )
+        if not increasing:
+            lower, upper = upper, lower
+        return self._from_bounds( lower, upper )
+
+    def _restrict(self, lower, upper, name):
+        """
+        Intersecci\'on del intervalo con el dominio [lower, upper] de la
+        funci\'on `name`; si no se intersectan, ValueError
+        """
+        if self.is_empty() or (self.lo >= lower and self.hi <= upper):
+            return self
+
+        if self.hi < lower or self.lo > upper:
+            txt_error = 'Interval {} is outside the domain [{}, {}] '\
+                'of {}(x).'.format(self, lower, upper, name)
+            raise ValueError( txt_error )
+
+        record_event( name + '_domain', "Interval {} is not contained in the domain "
+                      "[{}, {}] of {}(x); restricting to it", self, lower, upper, name )
+        return self.__class__( max(self.lo, lower), min(self.hi, upper) )
+
+    def sqrt(self):
+        """
+        Ra\'iz cuadrada; como en `log`, se restringe al dominio [0, +inf]
+        """
+        return self._restrict( 0, mpf('inf'), 'sqrt' )._monotone( 'sqrt' )
+
+    def asin(self):
+        return self._restrict( -1, 1, 'asin' )._monotone( 'asin' )
+
+    def acos(self):
+        return self._restrict( -1, 1, 'acos' )._monotone( 'acos', increasing=False )
+
+    def atan(self):
+        return self._monotone( 'atan' )
+
+    def sinh(self):
+        return self._monotone( 'sinh' )
+
+    def cosh(self):
+        """
+        Coseno hiperb\'olico: es par, con m\'inimo en 0
+        """
+        return self.__class__( self.mig(), self.mag() )._monotone( 'cosh' )
+
+    def tanh(self):
+        return self._monotone( 'tanh' )
+
+    def expm1(self):
+        """
+        exp(x) - 1, sin la cancelaci\'on de `exp(x) - 1` cerca de 0
+        """
+        return self._monotone( 'expm1' )
+
+    def log1p(self):
+        """
+        log(1 + x), sin la p\'erdida de precisi\'on de `log(1 + x)` cerca de 0;
+        se restringe al dominio [-1, +inf]
+        """
+        return self._restrict( -1, mpf('inf'), 'log1p' )._monotone( 'log1p' )
 
 
     # Las relaciones que sirven para checar el orden parcial
@@ -405,7 +522,8 @@ class Intervalo(object):
         Aqu\'i se checa la igualdad de dos intervalos; operador '=='
         """
         try:
-            return self.lo == otro.lo and self.hi == otro.hi
+            return (self.lo == otro.lo and self.hi == otro.hi) or \
+                (self.is_empty() and otro.is_empty())
         except:
             return self == Intervalo(otro)
 
@@ -415,6 +533,18 @@ class Intervalo(object):
         """
         return not self == otro
 
+    def __hash__(self):
+        """
+        Consistente con '==', para usarlos como llaves de diccionarios (p.ej.
+        para memoizar fun(x)): todos los vac\'ios tienen el mismo hash, y un
+        intervalo delgado [a, a] el de a, pues es igual al n\'umero a
+        """
+        if self.is_empty():
+            return hash('empty interval')
+        if self.lo == self.hi:
+            return hash(self.lo)
+        return hash( (self.lo, self.hi) )
+
     def __le__(self, otro):
         """
         Se checa el ordenamiento de los intervalos (ver Tucker); 
@@ -474,33 +604,44 @@ class Intervalo(object):
 
     def intersection(self, otro):
         """
-        Intersecci\'on de intervalos
+        Intersecci\'on de intervalos; si son disjuntos es el intervalo vac\'io
         """
-        if not isinstance(otro, Intervalo):
-            otro = Intervalo(otro)
+        otro = self.make_interval(otro)
+
+        if self.is_empty() or otro.is_empty():
+            return self.empty()
 
         if self._is_empty_intersection(otro):
-            print "Intersection is empty: " \
-                  "Intervals {} and {} are disjoint".format(self,otro)
+            record_event( 'empty_intersection', "Intersection is empty: "
+                          "Intervals {} and {} are disjoint", self, otro )
+            return self.empty()
 
         else:
-            return Intervalo( max(self.lo,otro.lo), min(self.hi,otro.hi) )
+            return self.__class__( max(self.lo,otro.lo), min(self.hi,otro.hi) )
 
     def hull(self, otro):
         """Envoltura/casco de dos intervalos"""
-        return Intervalo( min(self.lo,otro.lo), max(self.hi,otro.hi) )
+        if otro.is_empty():
+            return self
+        if self.is_empty():
+            return otro
+        return self.__class__( min(self.lo,otro.lo), max(self.hi,otro.hi) )
 
     def union(self, otro):
-        """Uni\'on de intervalos"""
-        if not isinstance(otro, Intervalo):
-            otro = Intervalo(otro)
+        """
+        Uni\'on de intervalos; si son disjuntos, la uni\'on no es un intervalo
+        y se regresa un `MultiInterval` con ambos
+        """
+        otro = self.make_interval(otro)
 
-        if self._is_empty_intersection(otro):
-            print "Union yields no connected interval: " \
-                  "Intervals {} and {} are disjoint".format(self,otro)
-        else:
+        if self.is_empty() or otro.is_empty() or not self._is_empty_intersection(otro):
             return self.hull(otro)
 
+        from multi_interval import MultiInterval
+        record_event( 'disconnected_union', "Union yields no connected interval: "
+                      "Intervals {} and {} are disjoint", self, otro )
+        return MultiInterval([ self, otro ])
+
     # Algunas funciones escalares de intervalos (ver Tucker)
     def diam(self):
         return self.hi-self.lo
@@ -530,7 +671,7 @@ class Intervalo(object):
         NOTA: La función que regresa la máxima distancia al origen es `self.mag()`
         (magnitud) y la que regresa la mínima distancia es `self.mig()` ('mignitud').
         """
-        return Intervalo( self.mig(), self.mag() )
+        return self.__class__( self.mig(), self.mag() )
 
     def abs(self):     # use as i.abs()
         return abs(self)
@@ -554,10 +695,145 @@ class Intervalo(object):
         if isinstance(a, Intervalo):
             return a
 
-        return Intervalo(a)
+        return self.__class__(a)
 
 
 # Funciones extras
+_new_object = object.__new__
+_empty_intervals = {}
+
+
+# Eventos: en lugar de imprimir advertencias (lo que en un ciclo sobre muchos
+# subintervalos domina el tiempo de ejecuci\'on), las operaciones registran
+# eventos como 'log_domain' (se restringi\'o al dominio de log) o
+# 'empty_intersection' en un contador. El reporte se consulta despu\'es con
+# `event_report()`; con `warn_on_events()` los eventos se emiten tambi\'en como
+# `IntervalWarning`, que se pueden filtrar con el m\'odulo `warnings`.
+
+class IntervalWarning(UserWarning):
+    pass
+
+_events = {}
+_warn_events = False
+
+def record_event( name, message=None, *args ):
+    """
+    Cuenta el evento `name`; el mensaje (con formato message.format(*args))
+    s\'olo se construye si las advertencias est\'an activas
+    """
+    _events[name] = _events.get(name, 0) + 1
+    if _warn_events and message is not None:
+        warnings.warn( message.format(*args), IntervalWarning, stacklevel=3 )
+
+def event_report():
+    """Diccionario {evento: n\'umero de veces} desde el \'ultimo `reset_events`"""
+    return dict(_events)
+
+def reset_events():
+    _events.clear()
+
+def warn_on_events( flag=True ):
+    """Activa (o desactiva) la emisi\'on de cada evento como `IntervalWarning`"""
+    global _warn_events
+    _warn_events = flag
+
+
+# Reducci\'on de argumentos de las funciones trigonom\'etricas
+
+_one, _minus_one = mpf(1), mpf(-1)
+_half_pi_cache = {}
+
+def _half_pi( prec ):
+    """pi/2 con `prec` bits, calculado una sola vez por precisi\'on"""
+    try:
+        return _half_pi_cache[prec]
+    except KeyError:
+        with mp.workprec(prec):
+            value = _half_pi_cache[prec] = mp.pi / 2
+        return value
+
+def _quadrant( x ):
+    """
+    El entero q tal que q*pi/2 <= x < (q+1)*pi/2. Como en la reducci\'on de
+    Payne-Hanek, para argumentos grandes se usa pi con tantos bits extra como
+    tenga la parte entera de x, para que q sea correcto; la precisi\'on se
+    redondea a m\'ultiplos de 64 bits para reusar los valores de pi/2.
+    """
+    prec = mp.prec + max(0, mp.mag(x)) + 16
+    prec += -prec % 64
+    with mp.workprec(prec):
+        return int( mp.floor( x / _half_pi(prec) ) )
+
+
+# Cach\'e LRU (opcional) de las funciones elementales de mpmath evaluadas en los
+# extremos: los algoritmos adaptativos y `plot_interval_f` eval\'uan muchas veces
+# los mismos extremos. La llave incluye la precisi\'on y el redondeo de `mp`.
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+class _LRUCache(object):
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self.data = OrderedDict()
+
+    def get(self, key, compute):
+        try:
+            value = self.data.pop(key)
+            self.hits += 1
+        except KeyError:
+            value = compute()
+            self.misses += 1
+            if len(self.data) >= self.maxsize:
+                self.data.popitem(last=False)   # least recently used
+
+        self.data[key] = value
+        return value
+
+_cache = None
+
+def enable_cache( maxsize=4096 ):
+    """
+    Activa el cach\'e de las funciones elementales sobre los extremos de los
+    intervalos, con a lo m\'as `maxsize` valores (se descartan los usados hace
+    m\'as tiempo). Activarlo de nuevo vac\'ia el cach\'e.
+    """
+    global _cache
+    _cache = _LRUCache(maxsize)
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+def cache_info():
+    """Estad\'isticas del cach\'e (hits, misses, maxsize, currsize), o None"""
+    if _cache is None:
+        return None
+    return CacheInfo(_cache.hits, _cache.misses, _cache.maxsize, len(_cache.data))
+
+def _mp_eval( name, x ):
+    """mp.<name>(x), usando el cach\'e si est\'a activo"""
+    fun = getattr(mp, name, None) or _MP_FALLBACKS[name]
+    if _cache is None:
+        return fun(x)
+
+    key = (name, x) + tuple(mp._prec_rounding)
+    return _cache.get( key, lambda: fun(x) )
+
+def _log1p( x ):
+    """
+    log(1 + x) para versiones de mpmath sin `mp.log1p`: 1 + x se calcula
+    exactamente, con los bits extra necesarios si x es peque\'no
+    """
+    x = mpf(x)
+    extra = max(0, -mp.mag(x)) if x else 0
+    with mp.workprec(mp.prec + extra + 10):
+        y = mp.log(1 + x)
+    return +y
+
+_MP_FALLBACKS = { 'log1p': _log1p }
+
 def make_mpf(a):
 
 	if isinstance(a, mpf):
@@ -565,37 +841,99 @@ def make_mpf(a):
 
 	return mpf(str(a))
 
+EMPTY = Intervalo.empty()
+
 
 def exp(a):
     try:
         return a.exp()
-    except:
+    except AttributeError:
         return mp.exp(a)
 
 def log(a):
     try:
         return a.log()
-    except:
+    except AttributeError:
         return mp.log(a)
 
 def sin(a):
     try:
         return a.sin()
-    except:
+    except AttributeError:
         return mp.sin(a)
 
 def cos(a):
     try:
         return a.cos()
-    except:
+    except AttributeError:
         return mp.cos(a)
 
 def tan(a):
     try:
         return a.tan()
-    except:
+    except AttributeError:
         return mp.tan(a)
 
+def sqrt(a):
+    try:
+        return a.sqrt()
+    except AttributeError:
+        return mp.sqrt(a)
+
+def asin(a):
+    try:
+        return a.asin()
+    except AttributeError:
+        return mp.asin(a)
+
+def acos(a):
+    try:
+        return a.acos()
+    except AttributeError:
+        return mp.acos(a)
+
+def atan(a):
+    try:
+        return a.atan()
+    except AttributeError:
+        return mp.atan(a)
+
+def sinh(a):
+    try:
+        return a.sinh()
+    except AttributeError:
+        return mp.sinh(a)
+
+def cosh(a):
+    try:
+        return a.cosh()
+    except AttributeError:
+        return mp.cosh(a)
+
+def tanh(a):
+    try:
+        return a.tanh()
+    except AttributeError:
+        return mp.tanh(a)
+
+def expm1(a):
+    try:
+        return a.expm1()
+    except AttributeError:
+        return mp.expm1(a)
+
+def log1p(a):
+    try:
+        return a.log1p()
+    except AttributeError:
+        return _mp_eval('log1p', a)
+
+def sincos(a):
+    try:
+        return a.sincos()
+    except AttributeError:
+        return mp.sin(a), mp.cos(a)
+
 
 def random_interval( infimum=-10.0, supremum=10.0 ):
     num1a = np.random.uniform( infimum, supremum )
@@ -603,68 +941,135 @@ def random_interval( infimum=-10.0, supremum=10.0 ):
     return Intervalo( num1a, num2a )
 
 
-def split_interval( x, num_divisions=1 ):
+def iter_split_interval( x, num_divisions=1 ):
     """
-    Divide un intervalo en n=num_divisions intervalos iguales
+    Generador de los n=num_divisions subintervalos iguales de x, sin
+    construir la lista completa (memoria O(1) para cualquier n). Los extremos
+    se calculan con mpf, y subintervalos consecutivos comparten el extremo
+    exactamente, de modo que su uni\'on es x.
     """
     num_divisions = int(num_divisions)
     if num_divisions < 1:
         num_divisions = 1
 
-    edge_points = np.linspace(x.lo, x.hi, num_divisions+1)
-    splited_intervals = [Intervalo(a, b) for (a,b) in zip(edge_points[:-1], edge_points[1:])]
+    width = x.hi - x.lo
+    a = x.lo
+    for k in range(1, num_divisions):
+        b = x.lo + width*k/num_divisions
+        yield x.__class__(a, b)
+        a = b
+    yield x.__class__(a, x.hi)
 
-    return splited_intervals
+def split_interval( x, num_divisions=1 ):
+    """
+    Divide un intervalo en n=num_divisions intervalos iguales
+    """
+    return list( iter_split_interval(x, num_divisions) )
 
-def range_interval_f( fun, subdivided_interval ):
+def range_interval_f( fun, subdivided_interval, parallel=False, executor=None, callback=None ):
     """
     Evalua la función f(x) extendida sobre intervalos, en una lista de subintervalos
     y regresa el hull de todos ellos, es decir, una cota del rango de la función
+
+    Los subintervalos pueden venir de cualquier iterable, p.ej. de
+    `iter_split_interval`; el hull se acumula conforme se evalúa, sin guardar
+    los resultados, así que la memoria no depende del número de subintervalos.
+
+    Si se da `callback`, se llama como callback(range_tot, subinterval, value)
+    después de cada evaluación; si regresa True se termina en ese momento y se
+    regresa el hull parcial (que sólo acota el rango sobre los subintervalos
+    evaluados), p.ej. para parar en cuanto el rango rebasa una cota.
+
+    Con parallel=True (o el número de procesos) las evaluaciones se reparten
+    en bloques entre un `multiprocessing.Pool`; también se puede dar un
+    `executor` ya creado (cualquier objeto con un método `map`, como un Pool
+    o un `concurrent.futures.ProcessPoolExecutor`). En ambos casos `fun`
+    debe poder serializarse con pickle (una función definida a nivel de módulo,
+    no una lambda). Los pools de hilos (`ThreadPool`, `ThreadPoolExecutor`)
+    se rechazan con ValueError: la precisión de mpmath es global y los hilos
+    la cambiarían entre sí. `callback` no se puede combinar con parallel ni
+    con executor (ValueError): los bloques se evalúan completos en otros
+    procesos.
     """
-    if not isinstance( subdivided_interval, list ):
+    if isinstance( subdivided_interval, Intervalo ):
         subdivided_interval = [ subdivided_interval ]
 
-    range_fun = [ fun(i) for i in subdivided_interval ]
-    range_tot = range_fun[0]
+    if parallel or executor is not None:
+        if callback is not None:
+            raise ValueError("range_interval_f: callback cannot be used with parallel/executor")
+        intervals = list(subdivided_interval)
+        if not intervals:
+            raise ValueError("range_interval_f needs at least one subinterval")
+        return _parallel_range( fun, intervals, parallel, executor )
+
+    range_tot = None
+    for i in subdivided_interval:
+        value = fun(i)
+        range_tot = value if range_tot is None else range_tot.hull(value)
+
+        if callback is not None and callback(range_tot, i, value):
+            break
 
-    for i in range_fun[1:]:
-        range_tot = range_tot.hull(i)
+    if range_tot is None:
+        raise ValueError("range_interval_f needs at least one subinterval")
 
     return range_tot
 
-def plot_interval_f( fun, x, pow2=0, num_points=101 ):
+def _range_chunk( fun, prec, chunk ):
+    """Hull de fun sobre un bloque de subintervalos (se ejecuta en otro proceso)"""
+    with mp.workprec(prec):
+        return _tree_hull( [ fun(i) for i in chunk ] )
+
+def _tree_hull( intervals ):
+    """Hull de una lista de intervalos, reduciendo por pares (en árbol)"""
+    while len(intervals) > 1:
+        pairs = [ a.hull(b) for (a, b) in zip(intervals[::2], intervals[1::2]) ]
+        intervals = pairs + intervals[len(pairs)*2:]
+    return intervals[0]
+
+def _is_thread_executor( executor ):
+    """Verifica si el executor corre en hilos del mismo proceso"""
+    from multiprocessing.pool import ThreadPool
+    if isinstance( executor, ThreadPool ):
+        return True
+
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+    except ImportError:
+        return False
+    return isinstance( executor, ThreadPoolExecutor )
+
+def _parallel_range( fun, intervals, parallel, executor ):
+    from functools import partial
+    import multiprocessing
+
+    if _is_thread_executor( executor ):
+        raise ValueError("range_interval_f needs a process-based executor: "
+                         "threads share mpmath's global precision")
+
+    if executor is None:
+        processes = None if parallel is True else int(parallel)
+        pool = multiprocessing.Pool(processes)
+        try:
+            return _parallel_range( fun, intervals, parallel, pool )
+        finally:
+            pool.terminate()
+            pool.join()
+
+    # varios bloques por proceso, para repartir mejor la carga
+    num_chunks = 4 * multiprocessing.cpu_count()
+    size = max( 1, -(-len(intervals) // num_chunks) )
+    chunks = [ intervals[k:k+size] for k in range(0, len(intervals), size) ]
+
+    hulls = executor.map( partial(_range_chunk, fun, mp.prec), chunks )
+    return _tree_hull( list(hulls) )
+
+def plot_interval_f( *args, **kwargs ):
     """
-    This plots the interval extension of a function `fun` over the interval `x`,
-    which is diveded in num=1,2,4,...,2**pow2 uniform subintervals.
+    Ver `plotting.plot_interval_f`; matplotlib se importa hasta que se dibuja
     """
-    num_intervals = [ 2**p for p in range(pow2+1) ]
-    plt.figure()
-    plt.subplot(1, 1, 1)
-
-    for num in num_intervals:
-        fact_alfa = num*1.0/num_intervals[-1]   # for plotting
-
-        # Se divide los subintervaloe en 2**num subintervalos iguales
-        subdivided_intervals = split_interval( x, num )
-        # Se calculan las extensiones de la función sobre el intervalo, usando los subintervalos
-        rango_total = range_interval_f( fun, subdivided_intervals )
-        print "Rango_tot (N={}) = {}".format(num,rango_total)
-        
-        # Hago el dibujo
-        for x1 in subdivided_intervals:
-            low = float(x1.lo)
-            high = float(x1.hi)
-            Ffun = fun(x1)
-            xa1 = np.array([low, low, high, high])
-            ya1 = np.array([float(Ffun.lo), float(Ffun.hi), float(Ffun.hi), float(Ffun.lo) ])
-            plt.fill( xa1, ya1, 'b', alpha=fact_alfa )
-    
-    low = float(x.lo)
-    high = float(x.hi)
-    xx = np.linspace(low,high,num_points)
-    yy = fun(xx)
-    plt.plot( xx, yy, 'red')
-    return 
+    from plotting import plot_interval_f
+    return plot_interval_f( *args, **kwargs )
 
 # Correct (directed) rounding:
 # in each calculation of the lower bound, "floor" rounding must be used;
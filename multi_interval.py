@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+# Uniones finitas de intervalos disjuntos, p.ej. el resultado de la divisi\'on
+# extendida [1, 2] / [-1, 1] = [-inf, -1] U [1, inf], que con la divisi\'on
+# usual se pierde en [-inf, inf].
+
+from intervalo import Intervalo
+
+
+class MultiInterval(object):
+    """
+    Uni\'on de intervalos disjuntos (`pieces`), ordenados de izquierda a
+    derecha; los intervalos que se traslapan se unen al construirla, y los
+    vac\'ios se descartan. Sin piezas representa al conjunto vac\'io.
+
+    Las operaciones se hacen pieza por pieza, y la divisi\'on usa
+    `Intervalo.extended_division`, de modo que el resultado sigue siendo un
+    `MultiInterval`.
+    """
+
+    __slots__ = ('pieces',)
+
+    def __init__(self, pieces=()):
+        if isinstance(pieces, Intervalo):
+            pieces = [pieces]
+
+        pieces = sorted( (piece for piece in pieces if not piece.is_empty()),
+                         key=lambda piece: piece.lo )
+        merged = pieces[:1]
+        for piece in pieces[1:]:
+            if piece.lo <= merged[-1].hi:
+                merged[-1] = merged[-1].hull(piece)
+            else:
+                merged.append(piece)
+
+        self.pieces = merged
+
+
+    def __repr__(self):
+        return "MultiInterval({})".format(repr(self.pieces))
+
+    def __str__(self):
+        if not self.pieces:
+            return "{}"
+        return " U ".join( str(piece) for piece in self.pieces )
+
+    def __len__(self):
+        return len(self.pieces)
+
+    def __iter__(self):
+        return iter(self.pieces)
+
+    def __eq__(self, otro):
+        return list(self) == list(self.make_multi(otro))
+
+    def __ne__(self, otro):
+        return not self == otro
+
+    def __contains__(self, x):
+        return any( x in piece for piece in self.pieces )
+
+    def is_empty(self):
+        return not self.pieces
+
+
+    def hull(self, otro=None):
+        """
+        El intervalo m\'as chico que contiene a todas las piezas (y a otro,
+        si se da); para el conjunto vac\'io es `Intervalo.empty()`
+        """
+        pieces = list(self) if otro is None else list(self) + list(self.make_multi(otro))
+        if not pieces:
+            return Intervalo.empty()
+
+        return pieces[0].__class__( min(p.lo for p in pieces), max(p.hi for p in pieces) )
+
+    def intersection(self, otro):
+        otro = self.make_multi(otro)
+        return MultiInterval( a.intersection(b) for a in self for b in otro
+                              if not a._is_empty_intersection(b) )
+
+    def union(self, otro):
+        return MultiInterval( list(self) + list(self.make_multi(otro)) )
+
+
+    def _combine(self, otro, operation):
+        otro = self.make_multi(otro)
+        return MultiInterval( operation(a, b) for a in self for b in otro )
+
+    def __add__(self, otro):
+        return self._combine( otro, lambda a, b: a + b )
+
+    def __radd__(self, otro):
+        return self + otro
+
+    def __sub__(self, otro):
+        return self._combine( otro, lambda a, b: a - b )
+
+    def __rsub__(self, otro):
+        return -(self - otro)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return MultiInterval( -a for a in self )
+
+    def __mul__(self, otro):
+        return self._combine( otro, lambda a, b: a * b )
+
+    def __rmul__(self, otro):
+        return self * otro
+
+    def __div__(self, otro):
+        otro = self.make_multi(otro)
+        return MultiInterval( piece for a in self for b in otro
+                              for piece in a.extended_division(b) )
+
+    __truediv__ = __div__
+
+    def __rdiv__(self, otro):
+        return self.make_multi(otro) / self
+
+    __rtruediv__ = __rdiv__
+
+    def __pow__(self, exponent):
+        return MultiInterval( a**exponent for a in self )
+
+
+    def _apply(self, name):
+        return MultiInterval( getattr(a, name)() for a in self )
+
+    def exp(self):
+        return self._apply('exp')
+
+    def log(self):
+        return self._apply('log')
+
+    def sqrt(self):
+        return self._apply('sqrt')
+
+    def sin(self):
+        return self._apply('sin')
+
+    def cos(self):
+        return self._apply('cos')
+
+    def tan(self):
+        return self._apply('tan')
+
+
+    def make_multi(self, a):
+        if isinstance(a, MultiInterval):
+            return a
+        if isinstance(a, Intervalo):
+            return MultiInterval([a])
+
+        return MultiInterval([ Intervalo(a) ])
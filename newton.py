@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# M\'etodo de Newton por intervalos para encontrar (y aislar) todos los ceros
+# de una funci\'on en un intervalo.
+
+from intervalo import Intervalo, mp
+
+
+def _bisect(x):
+    """
+    Divide el intervalo x en dos partes; el punto de corte est\'a ligeramente
+    desplazado del punto medio, para no caer justo en un cero en los casos
+    sim\'etricos (p.ej. sin(x) en [-a, a])
+    """
+    m = x.lo + 0.4990234375*(x.hi - x.lo)
+    return x.__class__(x.lo, m), x.__class__(m, x.hi)
+
+
+def _newton_pieces( x, m, fm, dfx ):
+    """
+    Piezas de N(x) = m - f(m)/f'(x) intersectadas con x. Como `mpf` redondea
+    al m\'as cercano, cada pieza se ensancha unos ulps para no perder el cero
+    cuando la caja ya es muy delgada.
+    """
+    eps = 4 * mp.mpf(2)**(-mp.prec)
+    pieces = (-fm).extended_division(dfx) + m
+    pieces = [ N.__class__(N.lo - eps*abs(N.lo), N.hi + eps*abs(N.hi)) for N in pieces ]
+    return [ x.intersection(N) for N in pieces if not x._is_empty_intersection(N) ]
+
+def newton_step( f, df, x ):
+    """
+    Un paso del operador de Newton por intervalos,
+    N(x) = m - f(m)/f'(x),  con m el punto medio de x,
+    intersectado con x. Si la derivada contiene al 0 se usa la divisi\'on
+    extendida, y el resultado puede tener dos piezas (o ninguna, si x no
+    contiene ceros). Regresa la lista de piezas.
+    """
+    m = x.__class__( x.mid() )
+    return _newton_pieces( x, m, f(m), df(x) )
+
+
+def interval_newton( f, df, x, tol=1e-10, max_iter=10000 ):
+    """
+    Encuentra todos los ceros de `f` en el intervalo x con el m\'etodo de
+    Newton por intervalos; `df` es la extensi\'on por intervalos de la
+    derivada de f.
+
+    Cada caja se contrae con el operador de Newton; las cajas que no se
+    contraen al menos a la mitad se bisectan. Se regresa una lista de pares
+    (intervalo, unique), ordenada: todos los ceros de f en x est\'an en la
+    uni\'on de los intervalos, y si `unique` es True el intervalo contiene
+    exactamente un cero (N(x) qued\'o en el interior de x, con 0 fuera de
+    f'(x)). Los intervalos con unique False pueden contener un cero m\'ultiple,
+    varios ceros o ninguno.
+    """
+    # no tiene sentido contraer por debajo de la precisi\'on de trabajo
+    rel_tol = 16 * mp.mpf(2)**(-mp.prec)
+
+    roots = []
+    stack = [ (x, False) ]
+    num_iter = 0
+
+    while stack:
+        box, unique = stack.pop()
+        num_iter += 1
+
+        if box.diam() < tol or box.diam() <= rel_tol*box.mag() or num_iter > max_iter:
+            roots.append( (box, unique) )
+            continue
+
+        m = box.__class__( box.mid() )
+        fm = f(m)
+        dfbox = df(box)
+        if 0 in fm and 0 in dfbox:
+            # no hay contracci\'on posible; se bisecta
+            stack.extend( (half, False) for half in _bisect(box) )
+            continue
+
+        pieces = _newton_pieces( box, m, fm, dfbox )
+        if len(pieces) == 1 and 0 not in dfbox:
+            N = pieces[0]
+            unique = unique or (box.lo < N.lo and N.hi < box.hi)
+
+        for piece in pieces:
+            if piece.diam() > 0.5*box.diam():
+                # poca contracci\'on: se bisecta
+                stack.extend( (half, False) for half in _bisect(piece) )
+            else:
+                stack.append( (piece, unique) )
+
+    return _merge_roots(roots)
+
+def _merge_roots( roots ):
+    """
+    Ordena las cajas y une las que se traslapan (p.ej. un cero justo en un
+    punto de bisecci\'on); la uni\'on ya no se considera certificada como \'unica
+    """
+    roots = sorted( roots, key=lambda root: root[0].lo )
+    merged = roots[:1]
+
+    for box, unique in roots[1:]:
+        last, last_unique = merged[-1]
+        if box.lo <= last.hi:
+            merged[-1] = ( last.hull(box), False )
+        else:
+            merged.append( (box, unique) )
+
+    return merged
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Gr\'aficas de extensiones de funciones sobre intervalos. Est\'a separado de
+# intervalo.py para que importar la aritm\'etica no cargue matplotlib (ni un
+# backend gr\'afico); intervalo.plot_interval_f importa este m\'odulo al usarse,
+# y pyplot s\'olo se carga si no se escribe directo a un archivo.
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from intervalo import iter_split_interval, _tree_hull
+
+
+def plot_interval_f( fun, x, pow2=0, num_points=101, filename=None ):
+    """
+    This plots the interval extension of a function `fun` over the interval `x`,
+    which is diveded in num=1,2,4,...,2**pow2 uniform subintervals.
+
+    Each level is evaluated once and drawn as a single PolyCollection, so
+    large subdivisions are practical. With `filename` the figure is rendered
+    straight to that file (Agg canvas, no interactive window). Returns the
+    list of total ranges, one per level.
+    """
+    if filename is None:
+        from matplotlib import pyplot as plt
+        figure = plt.figure()
+    else:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        figure = Figure()
+        FigureCanvasAgg(figure)
+    axes = figure.add_subplot(1, 1, 1)
+
+    num_intervals = [ 2**p for p in range(pow2+1) ]
+    rangos = []
+    for num in num_intervals:
+        fact_alfa = num*1.0/num_intervals[-1]   # for plotting
+
+        # Se evalúa la función sobre cada subintervalo una sola vez
+        enclosures = [ (x1, fun(x1)) for x1 in iter_split_interval( x, num ) ]
+        rangos.append( _tree_hull( [ Ffun for (x1, Ffun) in enclosures ] ) )
+
+        # Un rectángulo [x1] x [fun(x1)] por subintervalo
+        bounds = np.array([ (x1.lo, x1.hi, Ffun.lo, Ffun.hi) for (x1, Ffun) in enclosures ],
+                          dtype=np.float64)
+        low, high, f_low, f_high = bounds.T
+        verts = np.stack([ np.column_stack([low, f_low]), np.column_stack([low, f_high]),
+                           np.column_stack([high, f_high]), np.column_stack([high, f_low]) ],
+                         axis=1)
+        axes.add_collection( PolyCollection( verts, facecolors='b', edgecolors='b',
+                                             linewidths=0.5, alpha=fact_alfa ) )
+
+    low = float(x.lo)
+    high = float(x.hi)
+    xx = np.linspace(low,high,num_points)
+    yy = fun(xx)
+    axes.plot( xx, yy, 'red')
+    axes.autoscale_view()
+
+    if filename is not None:
+        figure.savefig(filename)
+
+    return rangos
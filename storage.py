@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Almacenamiento binario de tablas de intervalos. Las cotas se guardan como un
+# arreglo float64 de forma (2, n) (renglones lo y hi, redondeados hacia afuera)
+# en un archivo .npy, que se puede volver a abrir con mmap sin leerlo ni
+# convertirlo: `load_intervals` regresa un `IntervalArray` cuyas cotas son
+# vistas del archivo, y varios procesos pueden compartir la misma tabla.
+#
+# Opcionalmente se guardan tambi\'en las cotas `mpf` exactas en un segundo
+# archivo <nombre>.mpf.npy, con signo, mantisa (en palabras de 64 bits),
+# exponente y n\'umero de bits de cada cota.
+
+import os
+
+import numpy as np
+
+from intervalo import Intervalo, mp, mpf
+from interval_array import IntervalArray
+
+
+_WORD_BITS = 64
+_WORD_MASK = 2**_WORD_BITS - 1
+
+
+def _filenames(filename):
+    """Nombres del archivo de cotas float64 y del de cotas `mpf`"""
+    if not filename.endswith('.npy'):
+        filename += '.npy'
+    return filename, filename[:-len('.npy')] + '.mpf.npy'
+
+def _as_mpf(a):
+    """Convierte una cota (`mpf` o float) a `mpf` sin redondear"""
+    if isinstance(a, mpf):
+        return a
+    return mpf(float(a), prec=_WORD_BITS)   # 53 bits bastan para un float
+
+def _mpf_table(intervals):
+    """Arreglo estructurado (2, n) con (signo, exponente, bits, mantisa) de cada cota"""
+    bounds = [ [ _as_mpf(x.lo)._mpf_ for x in intervals ],
+               [ _as_mpf(x.hi)._mpf_ for x in intervals ] ]
+    max_bits = max( [1] + [ bc for row in bounds for (sign, man, exp, bc) in row ] )
+    num_words = -(-max_bits // _WORD_BITS)
+
+    dtype = np.dtype([ ('sign', np.int8), ('exp', np.int64), ('bc', np.int64),
+                       ('man', np.uint64, (num_words,)) ])
+    table = np.zeros( (2, len(intervals)), dtype=dtype )
+    for (i, row) in enumerate(bounds):
+        for (j, (sign, man, exp, bc)) in enumerate(row):
+            table[i, j] = ( sign, exp, bc,
+                            [ (man >> (_WORD_BITS*k)) & _WORD_MASK for k in range(num_words) ] )
+    return table
+
+def _mpf_from_row(row):
+    sign, exp, bc, words = row
+    man = 0
+    for word in reversed(words):
+        man = (man << _WORD_BITS) | int(word)
+    return mp.make_mpf( (int(sign), long(man), int(exp), int(bc)) )
+
+
+def save_intervals( filename, intervals, exact=False ):
+    """
+    Guarda los intervalos (un `IntervalArray` o una lista de `Intervalo`s) en
+    `filename` (.npy). Con exact=True se guardan tambi\'en las cotas `mpf`
+    exactas, para `load_exact_intervals`; si no, se borra el archivo de cotas
+    exactas que hubiera de una tabla anterior con el mismo nombre.
+    """
+    filename, mpf_filename = _filenames(filename)
+
+    if isinstance(intervals, IntervalArray):
+        table = np.array([ intervals.lo, intervals.hi ], dtype=np.float64)
+        intervals = intervals.to_intervals() if exact else None
+    else:
+        intervals = list(intervals)
+        table = IntervalArray.from_intervals(intervals)
+        table = np.array([ table.lo, table.hi ], dtype=np.float64)
+
+    np.save( filename, table )
+
+    if exact:
+        np.save( mpf_filename, _mpf_table(intervals) )
+    elif os.path.exists(mpf_filename):
+        os.remove(mpf_filename)
+
+def load_intervals( filename, mmap_mode='r' ):
+    """
+    Abre la tabla guardada con `save_intervals` como `IntervalArray`. Con el
+    valor por omisi\'on mmap_mode='r' el archivo se mapea a memoria (sin
+    copiarlo); mmap_mode=None lo lee completo.
+    """
+    table = np.load( _filenames(filename)[0], mmap_mode=mmap_mode )
+    return IntervalArray( table[0], table[1] )
+
+def load_exact_intervals( filename ):
+    """
+    Lista de `Intervalo`s con las cotas `mpf` exactas guardadas con
+    `save_intervals(..., exact=True)`
+    """
+    mpf_filename = _filenames(filename)[1]
+    if not os.path.exists(mpf_filename):
+        raise ValueError("{} was saved without exact bounds".format(filename))
+
+    table = np.load( mpf_filename )
+    return [ Intervalo._from_bounds( _mpf_from_row(lo), _mpf_from_row(hi) )
+             for (lo, hi) in zip(table[0], table[1]) ]
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from adaptive import *
+
+
+def test_global_minimize():
+
+    num_evaluations = [0]
+    def f(x):
+        num_evaluations[0] += 1
+        return x*(x-1)
+
+    x = Intervalo(-1, 1)
+    minimum, minimizers = global_minimize( f, x, tol=1e-4 )
+    assert -0.25 in minimum and minimum.diam() <= 1e-4
+    assert any( 0.5 in box for box in minimizers )
+    assert num_evaluations[0] < 1000
+
+    # la subdivisi\'on uniforme necesita muchas m\'as evaluaciones
+    rango = range_interval_f( f, [Intervalo(-1 + 2*mpf(k)/10000, -1 + 2*mpf(k+1)/10000)
+                                  for k in range(10000)] )
+    assert rango.lo < minimum.lo
+
+
+def test_range_enclose():
+
+    f = lambda x: sin(x) + x*(x-1)
+    x = Intervalo(-2, 3)
+    rango = range_enclose( f, x, tol=1e-3 )
+    xs = [ -2 + 5*mpf(k)/1000 for k in range(1001) ]
+    fs = [ mp.sin(t) + t*(t-1) for t in xs ]
+    assert rango.lo <= min(fs) and max(fs) <= rango.hi
+    assert max(fs) - min(fs) > rango.diam() - 3e-3
+
+    # the result has the class of x; an empty function gives an empty result
+    from float_interval import FloatInterval
+    assert type( range_enclose( f, FloatInterval(-2, 3) ) ) is FloatInterval
+    g = lambda y: y.intersection( Intervalo(10, 11) )
+    minimum, minimizers = global_minimize( g, Intervalo(-3, -1) )
+    assert minimum.is_empty() and minimizers == []
+    assert range_enclose( g, Intervalo(-3, -1) ).is_empty()
+
+
+def test_range_refinement():
+
+    num_evaluations = [0]
+    def f(x):
+        num_evaluations[0] += 1
+        return x*(x-1) + sin(3*x)
+
+    x = Intervalo(-1, 1)
+    refinement = RangeRefinement( f, x )
+    ranges = [ refinement.range() ]
+    for level in range(10):
+        ranges.append( refinement.refine() )
+    assert refinement.level == 10
+    assert refinement.num_evaluations == num_evaluations[0]
+
+    # every level is an enclosure, no worse than the previous one
+    for (r1, r2) in zip(ranges[:-1], ranges[1:]):
+        assert r1.lo <= r2.lo + 1e-12 and r2.hi <= r1.hi + 1e-12
+
+    # as tight as the uniform subdivision at the same level, with fewer evaluations
+    num_evaluations[0] = 0
+    uniform = range_interval_f( f, iter_split_interval(x, 2**10) )
+    assert abs(uniform.lo - ranges[-1].lo) < 1e-3 and abs(uniform.hi - ranges[-1].hi) < 1e-3
+    assert refinement.num_evaluations < num_evaluations[0] / 3
+    assert len(refinement.enclosures()) < 2**10 / 10
+
+
+def test_evaluate_adaptive():
+    import adaptive
+
+    precisions = []
+    evaluate = adaptive._evaluate_at_prec
+    def spy( fun, box, prec ):
+        precisions.append(prec)
+        return evaluate( fun, box, prec )
+
+    adaptive._evaluate_at_prec = spy
+    try:
+        # rounding-limited: more bits, no bisection
+        x = Intervalo( mpf(1)/3 )
+        y = evaluate_adaptive( lambda z: (z + 1e20) - 1e20, x, 1e-10 )
+        assert precisions == [53, 106]
+        assert abs(y.lo - x.lo) < 1e-10 and y.hi - y.lo <= 1e-10
+        assert mp.prec == 53
+
+        # dependency-limited: doubling does not help, so boxes are bisected in double precision
+        precisions[:] = []
+        y = evaluate_adaptive( lambda z: z - z, Intervalo(0, 1), 0.1 )
+        assert y.lo <= 0 <= y.hi and y.hi - y.lo <= 0.1
+        assert precisions.count(106) == 1 and set(precisions) == set([53, 106])
+
+        # bisection reaches the 53-bit rounding floor (~3e4): the halves raise their precision
+        precisions[:] = []
+        f = lambda z: (z - z)*1e6 + ((z + 1e20) - 1e20)
+        y = evaluate_adaptive( f, Intervalo(0, 1), 1e-3, max_evaluations=2000 )
+        assert y.lo <= 0 <= y.hi and y.hi - y.lo < 1e4
+        assert precisions.count(106) > precisions.count(53)
+
+        # the evaluation budget is respected (up to the pending boxes)
+        precisions[:] = []
+        y = evaluate_adaptive( lambda z: sin(z) - z, Intervalo(0, 1), 1e-9, max_evaluations=500 )
+        assert y.lo <= sin(mpf(1)) - 1 and 0 <= y.hi
+        assert len(precisions) < 2*500
+    finally:
+        adaptive._evaluate_at_prec = evaluate
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from autodiff import *
+from newton import interval_newton
+
+
+def contains(x, t, tol=1e-10):
+    # Intervalo no redondea hacia afuera: se tolera un error de redondeo
+    return x.lo - tol <= t <= x.hi + tol
+
+
+def test_derivative_enclosure():
+
+    funs = [ lambda x: x*sin(x) + exp(x)/(x + 3),
+             lambda x: log(x + 5)*cos(x)**2 - x**3,
+             lambda x: tan(x/4) + 2**x ]
+
+    for fun in funs:
+        for i in range(11):
+            x = random_interval(-1.5, 1.5)
+            fx, dfx = derivative_enclosure( fun, x )
+            assert fx == fun(x)
+
+            for t in [x.lo, x.mid(), x.hi]:
+                assert contains( dfx, mp.diff(lambda y: fun(Intervalo(y)).lo, t) )
+
+
+def test_derivative_con_newton():
+
+    f = lambda x: x**3 - 2*x - 5
+    roots = interval_newton( f, derivative(f), Intervalo(-4, 4) )
+    assert len(roots) == 1 and roots[0][1]
+    assert abs( f(roots[0][0]).mid() ) < 1e-10
+
+
+def test_taylor_interval():
+
+    fun = lambda x: exp(x)*sin(x)/(x**2 + 1) + log(x + 3)**3 - x**0.5
+    x = Intervalo(0.5, 1.5)
+    coeffs = fun( TaylorInterval.variable(x, order=3) ).coeffs
+    for t in [x.lo, x.mid(), x.hi]:
+        g = lambda y: fun(Intervalo(y)).lo
+        for k in range(4):
+            assert contains( coeffs[k], mp.diff(g, t, k) / mp.factorial(k) )
+
+
+def test_formas_centradas():
+
+    f = lambda x: x*(x-1)
+    split = lambda n: [ Intervalo(-1 + 2*mpf(k)/n, -1 + 2*mpf(k+1)/n) for k in range(n) ]
+
+    natural_64 = range_interval_f( f, split(64) )
+    natural_128 = range_interval_f( f, split(128) )
+    mean_value = range_interval_f( lambda y: mean_value_form(f, y), split(16) )
+    taylor = range_interval_f( lambda y: taylor_form(f, y), split(16) )
+
+    exact = Intervalo(-0.25, 2)
+    for rango in [natural_64, natural_128, mean_value, taylor]:
+        assert rango.lo <= exact.lo and exact.hi <= rango.hi
+
+    # la sobreestimaci\'on de las formas centradas decrece cuadr\'aticamente:
+    # con 16 subintervalos superan a la extensi\'on natural con 64 o 128
+    assert mean_value.diam() < natural_64.diam()
+    assert taylor.diam() < natural_128.diam()
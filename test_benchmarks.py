@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from benchmarks import *
+from StringIO import StringIO
+
+
+def test_benchmarks():
+
+    out = StringIO()
+    results = run_benchmarks( [15, 30], pattern="pow", min_time=0.001, out=out )
+    assert set(results) == set( "{}[dps={}]".format(name, dps) for dps in [15, 30]
+                                for name in ["pow_even", "pow_odd", "pow_negative",
+                                             "pow_fractional", "pow_interval", "rpow"] )
+    assert all( t > 0 for t in results.values() )
+    assert mp.dps == 15
+
+    old = { "a": 1.0, "b": 1.0, "c": 1.0, "d": None, "e": 1.0 }
+    new = { "a": 1.5, "b": 0.5, "c": 1.05, "d": 1.0, "f": 1.0 }
+    status = dict( (row[0], row[-1]) for row in compare_results(old, new) )
+    assert status == { "a": "slower", "b": "faster", "c": "same", "d": "error",
+                       "e": "missing", "f": "new" }
+
+
+def test_compare_exit_code():
+    import os, json, tempfile
+    import benchmarks
+
+    def bench_ok():
+        return lambda: None
+
+    def bench_failing():
+        raise RuntimeError("broken")
+
+    registered = list(benchmarks.BENCHMARKS)
+    benchmarks.BENCHMARKS[:] = [ ("ok_bench", bench_ok, True),
+                                 ("failing_bench", bench_failing, True),
+                                 ("once_bench", bench_ok, False) ]
+    handle, filename = tempfile.mkstemp(suffix='.json')
+    os.close(handle)
+
+    def compare( baseline ):
+        with open(filename, "w") as f:
+            json.dump( {"environment": {}, "results": baseline}, f )
+        return main([ "--compare", filename, "--dps", "15", "--min-time", "0.001" ])
+
+    try:
+        # benchmarks that do not depend on the precision run once
+        results = run_benchmarks( [15, 30], min_time=0.001, out=StringIO() )
+        assert sorted(results) == [ "failing_bench[dps=15]", "failing_bench[dps=30]",
+                                    "ok_bench[dps=15]", "ok_bench[dps=30]", "once_bench" ]
+        assert results["failing_bench[dps=15]"] is None
+
+        baseline = { "ok_bench[dps=15]": 1e3, "once_bench": 1e3 }
+        assert compare( baseline ) == 0                                 # faster, new
+        assert compare( dict(baseline, once_bench=1e-12) ) == 1         # slower
+        assert compare( dict(baseline, **{"failing_bench[dps=15]": 1.0}) ) == 1    # error
+        assert compare( dict(baseline, **{"gone_bench[dps=15]": 1.0}) ) == 1       # missing
+    finally:
+        benchmarks.BENCHMARKS[:] = registered
+        os.remove(filename)
+
+    assert [ (name, per_dps) for (name, setup, per_dps) in benchmarks.BENCHMARKS
+             if name == "import_intervalo" ] == [ ("import_intervalo", False) ]
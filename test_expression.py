@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from interval_array import *
+from expression import *
+import numpy as np
+
+
+def test_compile_interval():
+
+    fun = lambda x: x*(x - 1) + exp(x*(x - 1)) / (x*(x - 1) + 3)
+    f = compile_interval(fun)
+    assert f.num_nodes == 6    # x-1, x*(x-1), exp, +3, /, +
+
+    for k in range(20):
+        x = random_interval(-2, 2)
+        assert f(x) == fun(x)
+
+    X = split_interval_array( Intervalo(-2, 2), 100 )
+    assert np.all( f(X).lo == fun(X).lo ) and np.all( f(X).hi == fun(X).hi )
+
+    # commutative operations are shared, constants too
+    g = compile_interval( lambda x, y: (x*y + y*x, sin(x + 2) - sin(2 + x)) )
+    assert g.num_nodes == 5
+    x, y = Intervalo(1, 2), Intervalo(-1, 3)
+    assert g(x, y) == (x*y + y*x, sin(x + 2) - sin(2 + x))
+
+    for branching in [ lambda x: x if x > 0 else -x, lambda x: 1 if x == 0 else x,
+                       lambda x: x if x != 0 else 1 ]:
+        try:
+            compile_interval( branching )
+        except TypeError:
+            pass
+        else:
+            assert False
+
+
+def test_dependency_aware():
+
+    # x*x is rewritten as x**2, with the exact range of an even power
+    f = dependency_aware( lambda x: x*x*x*x - 1 )
+    assert f.single_use and f.num_nodes == 2
+    assert f(Intervalo(-1, 2)) == Intervalo(-1, 15)
+
+    # monotone in the repeated variable: exact range from the endpoints
+    f = dependency_aware( lambda x: x - x**2 )
+    assert f.occurrences == [2]
+    assert f(Intervalo(2, 3)) == Intervalo(-6, -2)
+    assert (lambda x: x - x**2)(Intervalo(2, 3)) == Intervalo(-7, -1)
+
+    g = dependency_aware( lambda x, y: x*y - x + exp(y) )
+    assert g.occurrences == [2, 2]
+    assert g(Intervalo(1, 2), Intervalo(1, 2)) == Intervalo(exp(1), 2 + exp(2))
+
+    # not monotone: at least as tight as the natural extension and the
+    # mean value form, and still an enclosure
+    h = dependency_aware( lambda x: x*(x - 1) )
+    x = Intervalo(0.25, 1)
+    assert h(x).lo <= -0.25 and h(x).hi >= 0
+    assert h(x).diam() < (x*(x - 1)).diam()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from float_interval import *
+import numpy as np
+
+
+def test_redondeo_hacia_afuera():
+
+    for x in [1.0, -1.0, 0.1, 1e300, -5e-324, 0.0]:
+        assert next_down(x) < x < next_up(x)
+        assert next_up(x) == np.nextafter(x, np.inf)
+        assert next_down(x) == np.nextafter(x, -np.inf)
+
+    a = FloatInterval('0.1')
+    with mp.workdps(30):
+        assert a.lo < mpf('0.1') < a.hi
+    assert isinstance(a.lo, float) and isinstance(a.hi, float)
+
+    # integers beyond 2**53 are rounded outward too
+    n = 2**53 + 1
+    b = FloatInterval(n)
+    assert b.lo < n < b.hi and b.lo == 2.0**53
+    with mp.workprec(200):
+        c = FloatInterval(mpf(1)/3)
+        assert c.lo < mpf(1)/3 < c.hi
+
+
+def test_contiene_al_resultado_de_intervalo():
+
+    for i in range(51):
+        a = random_interval()
+        b = random_interval()
+        fa = FloatInterval(a.lo, a.hi)
+        fb = FloatInterval(b.lo, b.hi)
+
+        for (c, fc) in [ (a + b, fa + fb), (a - b, fa - fb), (a * b, fa * fb),
+                         (a**2, fa**2), (a**3, fa**3), (exp(a), exp(fa)),
+                         (sin(a), sin(fa)), (cos(a), cos(fa)) ]:
+            assert isinstance(fc, FloatInterval)
+            assert fc.lo <= c.lo and c.hi <= fc.hi
+
+    assert FloatInterval(1, 2).sin().hi == 1.0
+    assert FloatInterval(1, 2).tan().hi == float('inf')
+
+
+def test_interval_class():
+
+    assert interval_class() is FloatInterval
+    old_dps = mp.dps
+    mp.dps = 30
+    try:
+        assert isinstance(interval(1, 2), Intervalo)
+        assert not isinstance(interval(1, 2), FloatInterval)
+    finally:
+        mp.dps = old_dps
@@ -105,3 +105,332 @@ def test_log():
             raise ValueError("Lanzar este error es ok") 
     #
 
+
+
+def test_multiplicacion():
+
+    for i in range(51):
+        a = random_interval()
+        b = random_interval()
+        for (x, y) in [ (a, b), (abs(a), -abs(b)), (-abs(a), abs(b)), (abs(a), b), (a, -abs(b)) ]:
+            c = x * y
+            assert c.lo <= c.hi
+            assert c == x.mult1(y)
+
+
+def test_pow_conserva_la_clase():
+    class SubIntervalo(Intervalo):
+        __slots__ = ()
+
+    for y in [ SubIntervalo(-2, 1)**2, SubIntervalo(-1, 4)**0.5 ]:
+        assert type(y) is SubIntervalo
+    assert SubIntervalo(-2, 1)**2 == Intervalo(0, 4)
+    assert SubIntervalo(-1, 4)**0.5 == Intervalo(0, 2)
+
+
+def test_from_bounds():
+    # el constructor interno da lo mismo que el validado, con las mismas cotas
+    for (a, b) in [ (mpf(1), mpf(2)), (mpf(-3.5), mpf('0.1')), (mpf('-inf'), mpf(0)) ]:
+        x, y = Intervalo(a, b), Intervalo._from_bounds(a, b)
+        assert type(y) is Intervalo and y == x
+        assert y.lo is a and y.hi is b
+
+
+def test_slots_y_pickle():
+    import pickle
+
+    a = Intervalo(1, 2)
+    assert not hasattr(a, '__dict__')
+    for protocol in range(3):
+        b = pickle.loads(pickle.dumps(a, protocol))
+        assert b == a and isinstance(b, Intervalo)
+
+
+def _range_test_function(x):
+    return x**2 - 2*x + sin(x)
+
+def test_range_parallel():
+    from multiprocessing import Pool
+    from multiprocessing.pool import ThreadPool
+
+    edges = [ mpf(-3) + mpf(6)*k/37 for k in range(38) ]
+    pieces = [ Intervalo(a, b) for (a, b) in zip(edges[:-1], edges[1:]) ]
+    serial = range_interval_f( _range_test_function, pieces )
+
+    assert range_interval_f( _range_test_function, pieces, parallel=2 ) == serial
+    pool = Pool(3)
+    try:
+        assert range_interval_f( _range_test_function, pieces, executor=pool ) == serial
+        assert_raises( ValueError, range_interval_f, _range_test_function, [], executor=pool )
+        assert_raises( ValueError, range_interval_f, _range_test_function, pieces,
+                       executor=pool, callback=lambda *args: True )
+    finally:
+        pool.terminate()
+        pool.join()
+
+    threads = ThreadPool(2)
+    try:
+        assert_raises( ValueError, range_interval_f, _range_test_function, pieces, executor=threads )
+    finally:
+        threads.terminate()
+        threads.join()
+
+    with mp.workdps(40):
+        wide = range_interval_f( _range_test_function, pieces, parallel=2 )
+        assert wide == range_interval_f( _range_test_function, pieces )
+
+
+def test_iter_split_interval():
+
+    x = Intervalo(-3, 3)
+    pieces = iter_split_interval(x, 7)
+    assert not isinstance(pieces, list)
+
+    pieces = list(pieces)
+    assert pieces == split_interval(x, 7)
+    assert len(pieces) == 7
+    assert pieces[0].lo == x.lo and pieces[-1].hi == x.hi
+    assert all( a.hi == b.lo for (a, b) in zip(pieces[:-1], pieces[1:]) )
+
+    f = _range_test_function
+    assert range_interval_f( f, iter_split_interval(x, 50) ) == range_interval_f( f, split_interval(x, 50) )
+
+    # early exit: stop as soon as the range is known to exceed 10
+    evaluated = []
+    def callback(range_tot, subinterval, value):
+        evaluated.append(subinterval)
+        return range_tot.hi > 10
+
+    partial_range = range_interval_f( f, iter_split_interval(x, 1000), callback=callback )
+    assert partial_range.hi > 10 and len(evaluated) < 1000
+
+
+def test_cache():
+
+    x = Intervalo(0.5, 2.5)
+    assert hash(x) == hash(Intervalo(0.5, 2.5))
+    assert {x: 1}[Intervalo(0.5, 2.5)] == 1
+
+    # equal objects hash equal: thin intervals and numbers, empties of any class
+    from float_interval import FloatInterval
+    for (a, b) in [ (Intervalo(1), 1), (Intervalo(0.5), FloatInterval(0.5)),
+                    (Intervalo.empty(), FloatInterval.empty()), (x, FloatInterval(0.5, 2.5)) ]:
+        assert a == b and hash(a) == hash(b)
+    assert cache_info() is None
+
+    enable_cache(maxsize=100)
+    try:
+        results = [ (exp(x), log(x), sin(x), cos(x)) for k in range(3) ]
+        assert results[0] == results[1] == results[2]
+        info = cache_info()
+        assert info.misses == 8 and info.hits == 16 and info.currsize == 8
+
+        with mp.workdps(30):       # different precision: not reused
+            assert exp(x).lo != results[0][0].lo
+        assert cache_info().misses == 10
+
+        enable_cache(maxsize=3)     # least recently used values are dropped
+        exp(x); exp(x); log(x)
+        assert cache_info() == CacheInfo(2, 4, 3, 3)
+        exp(x)
+        assert cache_info() == CacheInfo(2, 6, 3, 3)
+    finally:
+        disable_cache()
+
+    assert cache_info() is None
+    assert exp(x) == results[0][0]
+
+
+def test_sin_cos_tan():
+
+    for k in range(50):
+        x = random_interval(-20, 20)
+        s, c = x.sincos()
+        assert s == sin(x) and c == cos(x)
+
+        points = [ x.lo + (x.hi - x.lo)*j/200 for j in range(201) ]
+        for (f, enclosure) in [(mp.sin, s), (mp.cos, c)]:
+            values = [ f(t) for t in points ]
+            assert enclosure.lo <= min(values) + 1e-12 and max(values) <= enclosure.hi + 1e-12
+            assert min(values) - enclosure.lo < 1e-2 and enclosure.hi - max(values) < 1e-2
+
+    # argument reduction of huge arguments
+    x = Intervalo(mpf(2)**70, mpf(2)**70 + mpf(2)**18)    # one ulp wide
+    assert sin(x) == Intervalo(-1, 1)
+    for t in [mpf(2)**70, mpf(3)**60, mpf(10)**22]:
+        with mp.workdps(60):
+            exact = mp.sin(t), mp.cos(t)
+        s, c = Intervalo(t).sincos()
+        assert abs(s.lo - exact[0]) < 1e-15 and abs(c.hi - exact[1]) < 1e-15
+
+    assert tan(Intervalo(1, 2)) == Intervalo(mpf('-inf'), mpf('inf'))
+    assert tan(Intervalo(-1, 1)) == Intervalo(mp.tan(-1), mp.tan(1))
+    assert tan(Intervalo(2, 4)) == Intervalo(mp.tan(2), mp.tan(4))
+
+
+def test_funciones_elementales():
+
+    x = Intervalo(0.25, 0.75)
+    for (f, g) in [(sqrt, mp.sqrt), (asin, mp.asin), (atan, mp.atan), (sinh, mp.sinh),
+                   (tanh, mp.tanh), (expm1, mp.expm1)]:
+        assert f(x) == Intervalo(g(x.lo), g(x.hi))
+        assert f is sqrt or f(-x) == Intervalo(g(-x.hi), g(-x.lo))
+
+    assert acos(x) == Intervalo(mp.acos(x.hi), mp.acos(x.lo))
+    assert cosh(Intervalo(-1, 2)) == Intervalo(1, mp.cosh(2))
+    assert log1p(x) == Intervalo(mp.log(1.25), mp.log(1.75))
+    assert log1p(Intervalo(-1, 0)).lo == mpf('-inf')
+
+    # restricted to the natural domain
+    assert sqrt(Intervalo(-1, 4)) == Intervalo(0, 2)
+    assert asin(Intervalo(0, 3)) == Intervalo(0, mp.pi/2)
+    for (f, y) in [(sqrt, Intervalo(-2, -1)), (acos, Intervalo(2, 3)), (log1p, Intervalo(-3, -2))]:
+        try:
+            f(y)
+        except ValueError:
+            pass
+        else:
+            assert False
+
+    # no cancellation near 0
+    tiny = Intervalo(mpf('1e-20'), mpf('2e-20'))
+    assert abs(expm1(tiny).lo - mpf('1e-20')) < 1e-30
+    assert abs(log1p(tiny).hi - mpf('2e-20')) < 1e-30
+
+
+def test_funciones_elementales_float():
+    from float_interval import FloatInterval
+
+    x = FloatInterval(0.25, 0.75)
+    for name in ['sqrt', 'asin', 'acos', 'atan', 'sinh', 'cosh', 'tanh', 'expm1', 'log1p']:
+        y = getattr(x, name)()
+        z = getattr(Intervalo(0.25, 0.75), name)()
+        assert isinstance(y, FloatInterval) and type(y.lo) is float
+        assert y.lo <= z.lo and z.hi <= y.hi and y.diam() - z.diam() < 1e-15
+
+    assert FloatInterval(-800, 800).sinh() == FloatInterval(float('-inf'), float('inf'))
+    assert FloatInterval(-1, 0).log1p().lo == float('-inf')
+
+
+def test_eventos():
+    import warnings
+    from float_interval import FloatInterval
+
+    reset_events()
+    x = Intervalo(-1, 2)
+    for k in range(3):
+        log(x)
+    x.intersection(Intervalo(5, 6))
+    sqrt(x)
+    FloatInterval(-1, 2).reciprocal()
+    assert event_report() == { 'log_domain': 3, 'empty_intersection': 1,
+                               'sqrt_domain': 1, 'division_by_zero': 1 }
+
+    warn_on_events()
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            log(x)
+        assert len(caught) == 1 and issubclass(caught[0].category, IntervalWarning)
+        assert 'log(x)' in str(caught[0].message)
+    finally:
+        warn_on_events(False)
+
+    # both backends count the same events
+    for cls in [Intervalo, FloatInterval]:
+        reset_events()
+        for y in [ cls(0, 1), cls(-1, 1), cls(1, 2) ]:
+            log(y)
+        assert event_report() == { 'log_domain': 2 }
+
+    reset_events()
+    assert event_report() == {}
+
+
+def test_intervalo_vacio():
+    from float_interval import FloatInterval, inf
+    from interval_array import IntervalArray
+    from multi_interval import MultiInterval
+
+    for cls in [Intervalo, FloatInterval]:
+        e = cls.empty()
+        assert e.is_empty() and e is cls.empty() and isinstance(e, cls)
+        assert e == cls.empty() and str(e) == "[empty]"
+
+        x = cls(1, 2)
+        assert x.intersection(cls(3, 4)) is cls.empty()
+        assert x.intersection(e).is_empty() and e.intersection(x).is_empty()
+        assert x.hull(e) == x and e.hull(x) == x
+        assert x.union(e) == x
+        assert 1.5 not in e
+
+        results = [ e + x, x - e, e * x, x * e, x / e, e / x, -e, e**2, e**3, e**0.5, e**-1,
+                    2**e, x**e, abs(e) ]
+        results += [ getattr(e, name)() for name in
+                     ['exp', 'log', 'sin', 'cos', 'tan', 'sqrt', 'asin', 'acos', 'atan',
+                      'sinh', 'cosh', 'tanh', 'expm1', 'log1p', 'reciprocal'] ]
+        results += list( e.sincos() )
+        assert all( r.is_empty() for r in results )
+        assert e.extended_division(x).is_empty()
+
+    # 0*inf is 0, not NaN: these products are not empty
+    for cls in [Intervalo, FloatInterval]:
+        a, b = cls(-1, 0), cls(-inf, inf)
+        assert a * b == b and a.mult1(b) == b
+        assert a / cls(-1, 1) == b
+        for z in [ cls(0) * b, cls(0).mult1(b), cls(0) / cls(-1, 1), cls(0) * cls(0, inf) ]:
+            assert not z.is_empty() and 0 in z and z.hi - z.lo < 1e-300
+    assert range_interval_f( lambda y: y * Intervalo(-inf, inf), [Intervalo(-1, 0)] ) == Intervalo(-inf, inf)
+
+    # disjoint union: not an interval
+    u = Intervalo(1, 2).union(Intervalo(3, 4))
+    assert isinstance(u, MultiInterval) and len(u) == 2
+    assert MultiInterval([ EMPTY ]).hull() is EMPTY
+
+    # batches: empty entries stay empty
+    X = IntervalArray([1, np.nan, -1], [2, np.nan, 0])
+    Y = (X * 2 + X**2)**0 - X.exp()
+    assert list(Y.is_empty()) == [False, True, False]
+    assert X[1].is_empty()
+
+
+def test_plot_interval_f():
+    import os, tempfile
+
+    calls = [0]
+    def f(x):
+        calls[0] += 1
+        return x*x - 2*x
+
+    handle, filename = tempfile.mkstemp(suffix='.png')
+    os.close(handle)
+    try:
+        rangos = plot_interval_f( f, Intervalo(-1, 3), pow2=6, filename=filename )
+        assert os.path.getsize(filename) > 0
+    finally:
+        os.remove(filename)
+
+    # each box is evaluated once, plus the curve
+    assert calls[0] == sum( 2**p for p in range(7) ) + 1
+    assert len(rangos) == 7
+    assert rangos[0] == range_interval_f( f, Intervalo(-1, 3) )
+    assert all( rangos[-1].lo <= y <= rangos[-1].hi for y in [-1, 3] )
+
+
+def test_import_sin_matplotlib():
+    import os, sys, subprocess, tempfile
+
+    # in a fresh interpreter: arithmetic does not load matplotlib, plotting does
+    script = ("import sys, intervalo\n"
+              "assert 'matplotlib' not in sys.modules\n"
+              "x = intervalo.Intervalo(1, 2)\n"
+              "assert intervalo.sin(x*x) in intervalo.Intervalo(-1, 1)\n"
+              "intervalo.plot_interval_f(lambda y: y*y, x, filename=sys.argv[1])\n"
+              "assert 'matplotlib' in sys.modules and 'matplotlib.pyplot' not in sys.modules\n")
+    handle, filename = tempfile.mkstemp(suffix='.png')
+    os.close(handle)
+    try:
+        directory = os.path.dirname(os.path.abspath(__file__))
+        subprocess.check_call([ sys.executable, "-c", script, filename ], cwd=directory)
+    finally:
+        os.remove(filename)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from interval_array import *
+import numpy as np
+
+
+def test_aritmetica_contiene_a_intervalo():
+
+    a = [random_interval() for i in range(51)]
+    b = [random_interval() for i in range(51)]
+    A = IntervalArray.from_intervals(a)
+    B = IntervalArray.from_intervals(b)
+
+    for (op, ops) in [ (lambda x, y: x + y, A + B), (lambda x, y: x - y, A - B),
+                       (lambda x, y: x * y, A * B) ]:
+        for i in range(51):
+            c = op(a[i], b[i])
+            assert ops.lo[i] <= c.lo and c.hi <= ops.hi[i]
+
+
+def test_funciones_elementales():
+
+    x = split_interval_array( Intervalo(-10, 10), 1000 )
+    for (fun, npfun) in [ (exp, np.exp), (sin, np.sin), (cos, np.cos),
+                          (lambda y: y**2, lambda y: y**2),
+                          (lambda y: y**3, lambda y: y**3) ]:
+        fx = fun(x)
+        for t in [x.lo, x.hi, x.mid()]:
+            assert np.all(fx.lo <= npfun(t)) and np.all(npfun(t) <= fx.hi)
+
+    fx = sin(x)
+    assert np.all(fx.lo >= -1) and np.all(fx.hi <= 1)
+    assert sin( IntervalArray(1.0, 2.0) ).hi == 1.0
+    assert cos( IntervalArray(3.0, 3.5) ).lo == -1.0
+
+    y = log( IntervalArray([-2.0, -1.0], [-1.0, 4.0]) )
+    assert np.isnan(y.lo[0]) and y.lo[1] == -np.inf
+
+    t = tan( IntervalArray([0.0, 1.0], [1.0, 2.0]) )
+    assert t.hi[0] < np.inf and t.lo[1] == -np.inf
+
+
+def test_range_interval_array():
+
+    f = lambda x: x*(x-1)
+    x = Intervalo(-1, 1)
+    rango = range_interval_array( f, split_interval_array(x, 1000) )
+    assert rango.lo <= -0.25 and rango.hi >= 2
+    assert rango.lo > -0.26 and rango.hi < 2.01
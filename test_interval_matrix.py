@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from interval_array import IntervalArray
+from interval_matrix import *
+import numpy as np
+
+
+def test_interval_dot():
+
+    a = [ [random_interval() for j in range(4)] for i in range(3) ]
+    b = [ [random_interval() for j in range(2)] for i in range(4) ]
+    A = IntervalMatrix.from_intervals(a)
+    B = IntervalMatrix.from_intervals(b)
+    C = A.dot(B)
+    assert C.shape == (3, 2)
+
+    for i in range(3):
+        for j in range(2):
+            c = a[i][0]*b[0][j] + a[i][1]*b[1][j] + a[i][2]*b[2][j] + a[i][3]*b[3][j]
+            assert C.lo[i, j] <= c.lo and c.hi <= C.hi[i, j]
+
+    x = IntervalArray.from_intervals([ random_interval() for i in range(4) ])
+    y = A.dot(x)
+    assert isinstance(y, IntervalArray) and y.lo.shape == (3,)
+    for t in [x.lo, x.hi, x.mid()]:
+        for s in [A.lo, A.hi]:
+            assert np.all(y.lo <= s.dot(t)) and np.all(s.dot(t) <= y.hi)
+
+
+def test_sistemas_lineales():
+
+    np.random.seed(1)
+    n = 20
+    mA = np.random.uniform(-1, 1, (n, n)) + n*np.eye(n)
+    A = IntervalMatrix(mA - 1e-6, mA + 1e-6)
+    b = IntervalArray(np.ones(n) - 1e-6, np.ones(n) + 1e-6)
+
+    X, verified = krawczyk_solve(A, b)
+    assert verified
+    x = np.linalg.solve(mA, np.ones(n))
+    assert np.all(X.lo <= x) and np.all(x <= X.hi)
+    assert (X.hi - X.lo).max() < 1e-5
+
+    Y = gauss_seidel(A, b)
+    assert np.all(Y.lo <= x) and np.all(x <= Y.hi)
+    assert (Y.hi - Y.lo).max() < 1e-5
+
+    # soluciones de sistemas extremos
+    for s in [-1, 1]:
+        z = np.linalg.solve(mA + s*1e-6, np.ones(n) - s*1e-6)
+        assert np.all(X.lo <= z) and np.all(z <= X.hi)
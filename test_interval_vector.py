@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from interval_vector import *
+import numpy as np
+
+
+def test_split_box():
+
+    X = IntervalVector([0, -1, 2], [1, 3, 2.5])
+    assert X.dim == 3 and X.diam() == 4
+    assert np.all(X.mid() == [0.5, 1, 2.25])
+
+    halves = split_box(X)
+    assert halves.num_boxes == 2
+    assert np.all(halves.lo == [[0, -1, 2], [0, 1, 2]])
+    assert np.all(halves.hi == [[1, 1, 2.5], [1, 3, 2.5]])
+    assert np.all(halves.box(0).hull(halves.box(1)).lo == X.lo)
+
+    quarters = split_box(halves, dim=0)
+    assert quarters.num_boxes == 4 and np.all(quarters.diam() == 2)
+
+    boxes = split_box_uniform(X, [2, 4, 1])
+    assert boxes.num_boxes == 8 and np.all(boxes.widths() == [0.5, 1, 0.5])
+
+    Y = IntervalVector([2, 0, 0], [3, 1, 3])
+    assert np.all(X.intersection(Y).is_empty())
+    assert not X.intersection(X).is_empty()
+
+
+def test_range_interval_box():
+
+    f = lambda X: X[0]*X[1] - X[1]**2 + sin(X[2])
+    X = IntervalVector.from_intervals([ Intervalo(-1, 1), Intervalo(0, 2), Intervalo(0, 1) ])
+
+    rango_1 = range_interval_box( f, X )
+    rango_n = range_interval_box( f, split_box_uniform(X, 20) )
+    assert rango_1.lo <= rango_n.lo and rango_n.hi <= rango_1.hi
+
+    # rango exacto: [-6, sin(1) + 1/4]
+    assert rango_n.lo <= -6 and rango_n.hi >= mp.sin(1) + 0.25
+    assert rango_n.lo > -6.5 and rango_n.hi < mp.sin(1) + 0.5
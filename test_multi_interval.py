@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from multi_interval import *
+from float_interval import FloatInterval
+
+
+def test_extended_division():
+
+    inf = mpf('inf')
+    x = Intervalo(1, 2)
+
+    assert x.extended_division(Intervalo(-1, 1)) == \
+        MultiInterval([ Intervalo(-inf, -1), Intervalo(1, inf) ])
+    assert (-x).extended_division(Intervalo(-1, 1)) == \
+        MultiInterval([ Intervalo(-inf, -1), Intervalo(1, inf) ])
+    assert x.extended_division(Intervalo(0, 4)) == MultiInterval(Intervalo(0.25, inf))
+    assert x.extended_division(Intervalo(-4, 0)) == MultiInterval(Intervalo(-inf, -0.25))
+    assert (-x).extended_division(Intervalo(0, 4)) == MultiInterval(Intervalo(-inf, -0.25))
+    assert x.extended_division(Intervalo(2, 4)) == MultiInterval(Intervalo(0.25, 1))
+    assert x.extended_division(Intervalo(0, 0)).is_empty()
+    assert Intervalo(-1, 1).extended_division(Intervalo(-1, 1)) == MultiInterval(Intervalo(-inf, inf))
+    assert Intervalo(0).extended_division(Intervalo(-1, 1)) == MultiInterval(Intervalo(0))
+    assert Intervalo(0).extended_division(Intervalo(0, 3)) == MultiInterval(Intervalo(0))
+    assert Intervalo(0).extended_division(Intervalo(0, 0)).is_empty()
+    assert MultiInterval(Intervalo(0)) / Intervalo(-1, 1) == MultiInterval(Intervalo(0))
+
+    y = FloatInterval(1, 2).extended_division(FloatInterval(-3, 3))
+    assert len(y) == 2 and all( isinstance(piece, FloatInterval) for piece in y )
+    assert 1/3. in y and -1/3. in y and 0 not in y
+
+    # division by a MultiInterval distributes over the pieces
+    assert MultiInterval(x) / MultiInterval([ Intervalo(-2, -1), Intervalo(1, 2) ]) == \
+        MultiInterval([ Intervalo(-2, -0.5), Intervalo(0.5, 2) ])
+
+
+def test_multi_interval():
+
+    z = MultiInterval([ Intervalo(3, 4), Intervalo(-1, 0), Intervalo(0.5, 1), Intervalo(0, 0.25) ])
+    assert len(z) == 3 and z.pieces[0] == Intervalo(-1, 0.25)
+    assert z.hull() == Intervalo(-1, 4)
+    assert 3.5 in z and 2 not in z
+
+    assert z.intersection(Intervalo(0, 3.5)) == \
+        MultiInterval([ Intervalo(0, 0.25), Intervalo(0.5, 1), Intervalo(3, 3.5) ])
+    assert z.intersection(Intervalo(1.5, 2)).is_empty()
+    assert z.union(Intervalo(1, 3)) == MultiInterval(Intervalo(-1, 0.25)).union(Intervalo(0.5, 4))
+
+    assert z + 1 == MultiInterval([ Intervalo(0, 1.25), Intervalo(1.5, 2), Intervalo(4, 5) ])
+    assert 2*z - z.hull() == MultiInterval(Intervalo(-6, 9))
+    assert (z**2).hull() == Intervalo(0, 16)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from newton import *
+
+
+def test_extended_reciprocal():
+
+    a = Intervalo(-2, 4).extended_reciprocal()
+    assert len(a) == 2
+    assert a[0].lo == mpf('-inf') and a[0].hi == -0.5
+    assert a[1].lo == 0.25 and a[1].hi == mpf('inf')
+
+    assert Intervalo(0, 4).extended_reciprocal() == [ Intervalo(0.25, mpf('inf')) ]
+    assert Intervalo(0).extended_reciprocal() == []
+
+
+def test_interval_newton():
+
+    f = lambda x: x**2 - 2
+    df = lambda x: 2*x
+    roots = interval_newton( f, df, Intervalo(-3, 3), tol=1e-12 )
+    assert len(roots) == 2
+    assert all( unique for (root, unique) in roots )
+    assert -mp.sqrt(2) in roots[0][0] and mp.sqrt(2) in roots[1][0]
+    assert roots[1][0].diam() < 1e-12
+
+    # f'(x) contiene al 0 en x: se requiere el rec\'iproco extendido
+    roots = interval_newton( sin, cos, Intervalo(-10, 10) )
+    assert len(roots) == 7
+    assert all( unique for (root, unique) in roots )
+    for (k, (root, unique)) in enumerate(roots):
+        assert (k - 3)*mp.pi in root
+
+    # no hay ceros
+    assert interval_newton( f, df, Intervalo(3, 4) ) == []
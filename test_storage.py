@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*- 
+
+# run using the command "nosetests" in the current directory
+
+from intervalo import *
+from storage import *
+from interval_array import IntervalArray
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from nose.tools import assert_raises
+
+
+def test_save_load():
+
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, "tabla")
+
+        # float64 bounds: loaded back memory-mapped, without copies
+        a = IntervalArray( [-1.5, 0.1, np.nan], [2.0, 0.2, np.nan] )
+        save_intervals( filename, a )
+        b = load_intervals( filename )
+        assert isinstance(b.lo.base, np.memmap) or isinstance(b.lo, np.memmap)
+        assert np.array_equal(b.lo[:2], a.lo[:2]) and np.array_equal(b.hi[:2], a.hi[:2])
+        assert b.is_empty()[2]
+        assert_raises( ValueError, load_exact_intervals, filename )
+
+        # mpf bounds: float64 table rounded outward, exact bounds kept aside
+        with mp.workprec(200):
+            intervals = [ Intervalo(mpf(1)/3, mp.pi), Intervalo(-mpf(2)**-300, mpf(10)**40),
+                          Intervalo(mpf('-inf'), 0), Intervalo.empty() ]
+        save_intervals( filename + ".npy", intervals, exact=True )
+
+        b = load_intervals( filename, mmap_mode=None )
+        for (x, y) in zip(intervals[:3], b.to_intervals()):
+            assert y.lo <= x.lo and x.hi <= y.hi
+
+        c = load_exact_intervals( filename )
+        assert mp.prec == 53
+        for (x, y) in zip(intervals[:3], c):
+            assert x.lo == y.lo and x.hi == y.hi
+        assert c[3].is_empty()
+
+        # saving without exact bounds drops the stale ones
+        save_intervals( filename, intervals )
+        assert_raises( ValueError, load_exact_intervals, filename )
+    finally:
+        shutil.rmtree(directory)